@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+
+"""
+Micro-benchmarks for CodeToast's pure-Python hot paths.
+
+Run from the repository root with ``python -m benchmarks``; see ``--help`` for
+writing and comparing against a JSON baseline.
+"""
+
+import collections
+import gc
+import time
+import timeit
+import typing
+
+__all__ = (
+    "BENCHMARKS",
+    "BenchmarkResult",
+    "benchmark",
+    "compare",
+    "run",
+)
+
+BenchmarkResult = collections.namedtuple("BenchmarkResult", "name best mean loops")
+
+BENCHMARKS: "collections.OrderedDict[str, typing.Callable]" = collections.OrderedDict()
+
+
+def benchmark(name: str):
+    """
+    Registers a benchmark. The decorated function does any setup and returns the
+    zero-argument callable to be timed.
+    """
+
+    def decorator(func: typing.Callable):
+        BENCHMARKS[name] = func
+        return func
+
+    return decorator
+
+
+def run(
+    pattern: str = "", repeat: int = 5, min_time: float = 0.2
+) -> typing.List[BenchmarkResult]:
+    results = []
+
+    for name, setup in BENCHMARKS.items():
+        if pattern not in name:
+            continue
+
+        target = setup()
+        timer = timeit.Timer(target, timer=time.perf_counter)
+
+        loops, elapsed = timer.autorange()
+        if elapsed < min_time:
+            loops = max(1, int(loops * min_time / max(elapsed, 1e-9)))
+
+        gc.collect()
+        timings = [elapsed / loops for elapsed in timer.repeat(repeat, loops)]
+
+        results.append(
+            BenchmarkResult(name, min(timings), sum(timings) / len(timings), loops)
+        )
+
+    return results
+
+
+def compare(
+    results: typing.Iterable[BenchmarkResult],
+    baseline: typing.Dict[str, dict],
+    threshold: float = 1.2,
+) -> typing.List[typing.Tuple[BenchmarkResult, typing.Optional[float], bool]]:
+    """
+    Compares results against a baseline loaded from JSON, returning each result with
+    its ratio to the baseline's best time and whether that ratio exceeds threshold.
+    """
+
+    comparison = []
+
+    for result in results:
+        previous = baseline.get(result.name)
+
+        if previous is None:
+            comparison.append((result, None, False))
+            continue
+
+        ratio = result.best / previous["best"]
+        comparison.append((result, ratio, ratio > threshold))
+
+    return comparison
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+
+import argparse
+import json
+import platform
+import sys
+
+from benchmarks import compare, run
+from benchmarks import bench_hljs, bench_paginators  # noqa: F401 (registers benchmarks)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description="Run CodeToast's micro-benchmarks."
+    )
+    parser.add_argument(
+        "-k", dest="pattern", default="", help="only run matching names"
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="compare against this JSON baseline")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.2,
+        help="slowdown ratio that counts as a regression (default: 1.2)",
+    )
+    args = parser.parse_args(argv)
+
+    results = run(args.pattern, repeat=args.repeat)
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+
+    regressed = False
+
+    for result, ratio, slower in compare(results, baseline, args.threshold):
+        line = f"{result.name:<48} {result.best * 1000:>12.3f}ms"
+
+        if ratio is not None:
+            line += f"  x{ratio:.2f}{'  REGRESSION' if slower else ''}"
+
+        regressed = regressed or slower
+        print(line)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "python": sys.version,
+                    "platform": platform.platform(),
+                    "results": {
+                        result.name: {
+                            "best": result.best,
+                            "mean": result.mean,
+                            "loops": result.loops,
+                        }
+                        for result in results
+                    },
+                },
+                f,
+                indent=2,
+            )
+
+    return 1 if regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+
+from codetoast.hljs import (
+    _guess_sample,
+    get_language,
+    guess_file_traits,
+    guess_language,
+)
+
+from benchmarks import benchmark
+from benchmarks.corpora import large_log, minified_json, non_utf8_source, small_files
+
+
+@benchmark("get_language[small_files]")
+def get_language_small_files():
+    names = [name for name, _ in small_files()]
+
+    def target():
+        for name in names:
+            get_language(name)
+
+    return target
+
+
+@benchmark("get_language[unknown]")
+def get_language_unknown():
+    return lambda: get_language("application/octet-stream; charset=binary")
+
+
+@benchmark("guess_file_traits[large_log]")
+def guess_file_traits_log():
+    data = large_log()
+    return lambda: guess_file_traits(data)
+
+
+@benchmark("guess_file_traits[minified_json]")
+def guess_file_traits_json():
+    data = minified_json()
+    return lambda: guess_file_traits(data)
+
+
+@benchmark("guess_file_traits[non_utf8_source]")
+def guess_file_traits_non_utf8():
+    data = non_utf8_source()
+    return lambda: guess_file_traits(data)
+
+
+@benchmark("guess_file_traits[small_files]")
+def guess_file_traits_small_files():
+    files = [data for _, data in small_files()]
+
+    def target():
+        for data in files:
+            guess_file_traits(data)
+
+    return target
+
+
+@benchmark("guess_language[50MB log, cold]")
+def guess_language_huge_cold():
+    data = large_log(50 * 1024 * 1024)
+
+    def target():
+        _guess_sample.cache_clear()
+        guess_language(data)
+
+    return target
+
+
+@benchmark("guess_language[50MB log, memoized]")
+def guess_language_huge_warm():
+    data = large_log(50 * 1024 * 1024)
+    return lambda: guess_language(data)
+
+
+@benchmark("guess_language[small_files, cold]")
+def guess_language_small_files():
+    files = [data for _, data in small_files()]
+
+    def target():
+        _guess_sample.cache_clear()
+        for data in files:
+            guess_language(data)
+
+    return target
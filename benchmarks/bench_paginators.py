@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+
+import io
+import types
+
+from codetoast.paginators import (
+    FilePaginator,
+    PaginatorInterface,
+    WrappedFilePaginator,
+    WrappedPaginator,
+)
+
+from benchmarks import benchmark
+from benchmarks.corpora import large_log, minified_json, non_utf8_source, small_files
+
+BOT = types.SimpleNamespace(loop=None, user=None)
+
+
+@benchmark("WrappedPaginator.add_line[large_log]")
+def wrapped_add_line_log():
+    lines = large_log().decode("utf-8").split("\n")
+
+    def target():
+        paginator = WrappedPaginator(max_size=1985)
+        for line in lines:
+            paginator.add_line(line)
+
+    return target
+
+
+@benchmark("WrappedPaginator.add_line[minified_json]")
+def wrapped_add_line_json():
+    line = minified_json().decode("utf-8")
+
+    def target():
+        paginator = WrappedPaginator(max_size=1985, wrap_on=(",", ":"))
+        paginator.add_line(line)
+
+    return target
+
+
+@benchmark("FilePaginator[large_log]")
+def file_paginator_log():
+    data = large_log()
+    return lambda: FilePaginator(io.BytesIO(data), language_hints=("log.txt",))
+
+
+@benchmark("WrappedFilePaginator[minified_json]")
+def file_paginator_json():
+    data = minified_json()
+    return lambda: WrappedFilePaginator(
+        io.BytesIO(data), language_hints=("data.json",), force_wrap=True
+    )
+
+
+@benchmark("FilePaginator[non_utf8_source]")
+def file_paginator_non_utf8():
+    data = non_utf8_source()
+    return lambda: FilePaginator(io.BytesIO(data))
+
+
+@benchmark("FilePaginator[small_files]")
+def file_paginator_small_files():
+    files = small_files()
+
+    def target():
+        for name, data in files:
+            FilePaginator(io.BytesIO(data), language_hints=(name,))
+
+    return target
+
+
+@benchmark("PaginatorInterface.pages[large_log]")
+def interface_pages():
+    paginator = FilePaginator(io.BytesIO(large_log()), max_size=1985)
+    interface = PaginatorInterface(BOT, paginator)
+    return lambda: interface.pages
+
+
+@benchmark("PaginatorInterface.send_kwargs[large_log]")
+def interface_send_kwargs():
+    paginator = FilePaginator(io.BytesIO(large_log()), max_size=1985)
+    interface = PaginatorInterface(BOT, paginator)
+    return lambda: interface.send_kwargs
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+"""
+Deterministic synthetic inputs for the benchmarks.
+"""
+
+import functools
+import json
+import random
+
+__all__ = (
+    "large_log",
+    "minified_json",
+    "non_utf8_source",
+    "small_files",
+)
+
+
+@functools.lru_cache(maxsize=None)
+def large_log(size: int = 4 * 1024 * 1024) -> bytes:
+    rng = random.Random(0)
+    levels = ("DEBUG", "INFO", "WARNING", "ERROR")
+    lines = []
+    total = 0
+
+    while total < size:
+        line = (
+            f"2021-04-19 12:{rng.randrange(60):02}:{rng.randrange(60):02},"
+            f"{rng.randrange(1000):03} {rng.choice(levels):<8} discord.gateway: "
+            f"Shard ID {rng.randrange(16)} has sent the HEARTBEAT payload "
+            f"(sequence {rng.randrange(10 ** 6)})"
+        )
+        lines.append(line)
+        total += len(line) + 1
+
+    return "\n".join(lines).encode("utf-8")
+
+
+@functools.lru_cache(maxsize=None)
+def minified_json(size: int = 1024 * 1024) -> bytes:
+    rng = random.Random(1)
+    records = []
+    total = 0
+
+    while total < size:
+        record = {
+            "id": rng.randrange(10 ** 18),
+            "name": f"user{rng.randrange(10 ** 6)}",
+            "roles": [rng.randrange(10 ** 18) for _ in range(3)],
+        }
+        records.append(record)
+        total += 90
+
+    return json.dumps(records, separators=(",", ":")).encode("utf-8")
+
+
+@functools.lru_cache(maxsize=None)
+def non_utf8_source(size: int = 512 * 1024) -> bytes:
+    header = "# -*- coding: latin-1 -*-\n"
+    body = "print('café, naïve, señor')  # ¡olé!\n"
+    return (header + body * (size // len(body))).encode("latin-1")
+
+
+@functools.lru_cache(maxsize=None)
+def small_files(count: int = 1000, size: int = 2048) -> tuple:
+    rng = random.Random(2)
+    extensions = ("py", "json", "yml", "toml", "cfg", "txt", "sh", "js")
+    files = []
+
+    for index in range(count):
+        extension = rng.choice(extensions)
+        shebang = "#!/usr/bin/env python3\n" if extension == "py" else ""
+        body = "".join(
+            f"key_{line} = {rng.randrange(10 ** 6)}\n" for line in range(size // 20)
+        )
+        files.append((f"config/file_{index}.{extension}", (shebang + body).encode()))
+
+    return tuple(files)
@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+
+"""
+In-process stand-ins for the parts of discord.py that CodeToast's interfaces and
+commands talk to, with simulated REST latency and rate limiting.
+"""
+
+import asyncio
+import collections
+import itertools
+import random
+import time
+import types
+import typing
+
+import discord
+
+__all__ = (
+    "FakeBot",
+    "FakeChannel",
+    "FakeContext",
+    "FakeGuild",
+    "FakeHTTP",
+    "FakeMessage",
+    "LoopMonitor",
+)
+
+SNOWFLAKES = itertools.count(10 ** 17)
+
+
+class FakeHTTP:
+    """
+    Counts simulated REST calls per route. Each call waits latency (plus up to jitter)
+    seconds, and a rate_limit fraction of calls is answered with a 429 that is retried
+    after retry_after seconds, as discord.py's HTTPClient would.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.05,
+        jitter: float = 0.0,
+        rate_limit: float = 0.0,
+        retry_after: float = 0.25,
+        seed: int = 0,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.calls = collections.Counter()
+        self.rate_limited = 0
+
+    @property
+    def total(self) -> int:
+        return sum(self.calls.values())
+
+    def reset(self):
+        self.calls.clear()
+        self.rate_limited = 0
+
+    async def request(self, route: str):
+        while True:
+            self.calls[route] += 1
+            await asyncio.sleep(self.latency + self.random.uniform(0, self.jitter))
+
+            if self.random.random() >= self.rate_limit:
+                return
+
+            self.rate_limited += 1
+            await asyncio.sleep(self.retry_after)
+
+
+class FakeMessage:
+    def __init__(self, http: FakeHTTP, channel: "FakeChannel", **kwargs):
+        self.id = next(SNOWFLAKES)
+        self.http = http
+        self.channel = channel
+        self.content = kwargs.get("content")
+        self.embed = kwargs.get("embed")
+        self.file = kwargs.get("file")
+        self.reactions: typing.List[str] = []
+        self.edits = 0
+        self.deleted = False
+
+    def check_deleted(self):
+        if self.deleted:
+            raise discord.NotFound(
+                types.SimpleNamespace(status=404, reason="Not Found"), "Unknown Message"
+            )
+
+    async def add_reaction(self, emoji):
+        self.check_deleted()
+        await self.http.request("PUT /channels/{id}/messages/{id}/reactions")
+        self.check_deleted()
+        if emoji not in self.reactions:
+            self.reactions.append(emoji)
+
+    async def remove_reaction(self, emoji, member):
+        self.check_deleted()
+        await self.http.request("DELETE /channels/{id}/messages/{id}/reactions")
+        if emoji in self.reactions:
+            self.reactions.remove(emoji)
+
+    async def edit(self, **kwargs):
+        self.check_deleted()
+        await self.http.request("PATCH /channels/{id}/messages/{id}")
+        self.check_deleted()
+        self.content = kwargs.get("content", self.content)
+        self.embed = kwargs.get("embed", self.embed)
+        self.edits += 1
+
+    async def delete(self):
+        self.check_deleted()
+        await self.http.request("DELETE /channels/{id}/messages/{id}")
+        self.deleted = True
+
+
+class FakeChannel:
+    def __init__(self, http: FakeHTTP):
+        self.id = next(SNOWFLAKES)
+        self.http = http
+        self.messages: typing.List[FakeMessage] = []
+
+    async def send(self, content=None, **kwargs):
+        await self.http.request("POST /channels/{id}/messages")
+        message = FakeMessage(self.http, self, content=content, **kwargs)
+        self.messages.append(message)
+        return message
+
+
+class FakeGuild:
+    def __init__(self, filesize_limit: int = 8 * 1024 * 1024):
+        self.id = next(SNOWFLAKES)
+        self.filesize_limit = filesize_limit
+
+
+class FakeBot:
+    """
+    Minimal commands.Bot stand-in: an event loop, a user, wait_for/dispatch and an
+    owner check.
+    """
+
+    def __init__(self, http: FakeHTTP, loop: asyncio.AbstractEventLoop = None):
+        self.http = http
+        self.loop = loop or asyncio.get_event_loop()
+        self.user = types.SimpleNamespace(id=next(SNOWFLAKES), name="CodeToast")
+        self.owner = types.SimpleNamespace(id=next(SNOWFLAKES), name="owner")
+        self.guilds = []
+        self.users = [self.user, self.owner]
+        self.cogs = {}
+        self.latency = 0.0
+        self.shard_count = None
+        self._listeners = collections.defaultdict(list)
+        self._closed = False
+
+    def is_closed(self) -> bool:
+        return self._closed
+
+    async def close(self):
+        self._closed = True
+
+    async def is_owner(self, user) -> bool:
+        return user.id == self.owner.id
+
+    def wait_for(self, event: str, *, check=None, timeout=None):
+        future = self.loop.create_future()
+        self._listeners[event].append((future, check))
+        return asyncio.wait_for(future, timeout)
+
+    def dispatch(self, event: str, *args):
+        listeners = self._listeners[event]
+        remaining = []
+
+        for future, check in listeners:
+            if future.done():
+                continue
+
+            try:
+                result = check is None or check(*args)
+            except Exception as exception:  # pylint: disable=broad-except
+                future.set_exception(exception)
+                continue
+
+            if result:
+                future.set_result(args[0] if len(args) == 1 else args)
+            else:
+                remaining.append((future, check))
+
+        self._listeners[event] = remaining
+
+    def react(self, message: FakeMessage, emoji: str, user=None, add: bool = True):
+        user = user or self.owner
+        event_type = "REACTION_ADD" if add else "REACTION_REMOVE"
+        payload = discord.RawReactionActionEvent(
+            {
+                "message_id": message.id,
+                "channel_id": message.channel.id,
+                "user_id": user.id,
+            },
+            discord.PartialEmoji(name=emoji),
+            event_type,
+        )
+        self.dispatch("raw_reaction_add" if add else "raw_reaction_remove", payload)
+
+
+class FakeContext:
+    def __init__(self, bot: FakeBot, channel: FakeChannel, guild: FakeGuild = None):
+        self.bot = bot
+        self.channel = channel
+        self.guild = guild
+        self.author = bot.owner
+
+    async def send(self, content=None, **kwargs):
+        return await self.channel.send(content, **kwargs)
+
+
+class LoopMonitor:
+    """
+    Measures event loop lag: how late a sleep of interval seconds wakes up.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.samples: typing.List[float] = []
+        self.task: asyncio.Task = None
+
+    async def run(self):
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, time.perf_counter() - start - self.interval))
+
+    def start(self):
+        self.samples.clear()
+        self.task = asyncio.get_event_loop().create_task(self.run())
+
+    def stop(self) -> dict:
+        if self.task:
+            self.task.cancel()
+
+        samples = sorted(self.samples) or [0.0]
+
+        return {
+            "max_lag": samples[-1],
+            "mean_lag": sum(samples) / len(samples),
+            "p99_lag": samples[min(len(samples) - 1, int(len(samples) * 0.99))],
+        }
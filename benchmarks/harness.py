@@ -0,0 +1,324 @@
+# -*- coding: utf-8 -*-
+
+"""
+End-to-end latency scenarios for PaginatorInterface and the FileSystem commands,
+run against the fakes in benchmarks.fake_discord instead of a live connection.
+
+Run from the repository root with ``python -m benchmarks.harness``.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+from codetoast.cog import CodeToast
+from codetoast.paginators import (
+    EMOJI_DEFAULT,
+    PaginatorInterface,
+    WrappedFilePaginator,
+    WrappedPaginator,
+)
+
+from benchmarks.corpora import large_log, minified_json
+from benchmarks.fake_discord import (
+    FakeBot,
+    FakeChannel,
+    FakeContext,
+    FakeGuild,
+    FakeHTTP,
+    LoopMonitor,
+)
+
+SCENARIOS = {}
+
+
+def scenario(func):
+    SCENARIOS[func.__name__] = func
+    return func
+
+
+def make_paginator(pages: int) -> WrappedPaginator:
+    paginator = WrappedPaginator(max_size=1985)
+    for index in range(pages * 20):
+        paginator.add_line(f"line {index} " + "x" * 80)
+    return paginator
+
+
+async def wait_until(predicate, timeout: float = 30.0, interval: float = 0.005):
+    deadline = time.perf_counter() + timeout
+    while not predicate():
+        if time.perf_counter() > deadline:
+            raise asyncio.TimeoutError
+        await asyncio.sleep(interval)
+
+
+@scenario
+async def send(bot: FakeBot, args) -> dict:
+    """
+    Sends args.paginators interfaces concurrently and waits for their reactions.
+    """
+
+    channel = FakeChannel(bot.http)
+    interfaces = [
+        PaginatorInterface(bot, make_paginator(args.pages), owner=bot.owner)
+        for _ in range(args.paginators)
+    ]
+
+    start = time.perf_counter()
+    await asyncio.gather(*(interface.send_to(channel) for interface in interfaces))
+    usable = time.perf_counter() - start
+
+    await asyncio.gather(
+        *(
+            interface.reaction_task
+            for interface in interfaces
+            if interface.reaction_task
+        )
+    )
+    ready = time.perf_counter() - start
+
+    calls = bot.http.total
+
+    return {
+        "send_to_latency": usable,
+        "reactions_ready_latency": ready,
+        "rest_calls_per_paginator": calls / len(interfaces),
+    }
+
+
+@scenario
+async def navigate(bot: FakeBot, args) -> dict:
+    """
+    Presses forward args.presses times on each of args.paginators interfaces.
+    """
+
+    channel = FakeChannel(bot.http)
+    interfaces = [
+        PaginatorInterface(bot, make_paginator(args.pages), owner=bot.owner)
+        for _ in range(args.paginators)
+    ]
+    await asyncio.gather(*(interface.send_to(channel) for interface in interfaces))
+    await asyncio.sleep(0)
+
+    bot.http.reset()
+    latencies = []
+
+    for press in range(1, args.presses + 1):
+        target = f"Page {min(press, args.pages - 1) + 1}/"
+        start = time.perf_counter()
+
+        for interface in interfaces:
+            bot.react(interface.message, EMOJI_DEFAULT.forward)
+
+        await wait_until(
+            lambda: all(
+                target in (interface.message.content or "") for interface in interfaces
+            )
+        )
+        latencies.append(time.perf_counter() - start)
+
+    calls = bot.http.total
+
+    return {
+        "press_latency_mean": sum(latencies) / len(latencies),
+        "press_latency_max": max(latencies),
+        "rest_calls_per_press": calls / (len(interfaces) * args.presses),
+    }
+
+
+@scenario
+async def stream(bot: FakeBot, args) -> dict:
+    """
+    Streams args.lines lines into each of args.paginators interfaces via add_line.
+    """
+
+    channel = FakeChannel(bot.http)
+    interfaces = []
+
+    for _ in range(args.paginators):
+        paginator = WrappedPaginator(max_size=1985)
+        paginator.add_line("$ stream")
+        interfaces.append(PaginatorInterface(bot, paginator, owner=bot.owner))
+
+    await asyncio.gather(*(interface.send_to(channel) for interface in interfaces))
+
+    bot.http.reset()
+    start = time.perf_counter()
+
+    async def feed(interface):
+        for index in range(args.lines):
+            await interface.add_line(f"output line {index}")
+            if index % 50 == 0:
+                await asyncio.sleep(0)
+
+    await asyncio.gather(*(feed(interface) for interface in interfaces))
+    fed = time.perf_counter() - start
+
+    await wait_until(
+        lambda: all(
+            interface.message.content == interface.send_kwargs["content"]
+            for interface in interfaces
+        )
+    )
+    settled = time.perf_counter() - start
+    calls = bot.http.total
+
+    return {
+        "feed_time": fed,
+        "settle_latency": settled,
+        "rest_calls_per_paginator": calls / len(interfaces),
+    }
+
+
+@scenario
+async def cat(bot: FakeBot, args) -> dict:
+    """
+    Runs toast cat on a generated log, once uploading it and once paginating it.
+    """
+
+    cog = CodeToast(bot=bot)
+    channel = FakeChannel(bot.http)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bot.log")
+        with open(path, "wb") as f:
+            f.write(large_log(args.file_size))
+
+        results = {}
+
+        for label, guild in (
+            ("upload", FakeGuild(filesize_limit=args.file_size * 2)),
+            ("paginate", FakeGuild(filesize_limit=1024 * 64)),
+        ):
+            cog.compress_uploads = False
+            cog.content_cache.clear()
+
+            for attempt in ("cold", "warm"):
+                ctx = FakeContext(bot, channel, guild)
+                bot.http.reset()
+
+                start = time.perf_counter()
+                await cog.toast_cat(ctx, path)
+                elapsed = time.perf_counter() - start
+
+                results[f"{label}_{attempt}_latency"] = elapsed
+                results[f"{label}_{attempt}_rest_calls"] = bot.http.total
+
+    return results
+
+
+@scenario
+async def paginate(bot: FakeBot, args) -> dict:
+    """
+    Paginates a generated log and minified JSON of args.file_size bytes, directly in
+    the coroutine and through WrappedFilePaginator.create, measuring loop lag.
+    """
+
+    results = {}
+
+    for corpus, content in (
+        ("log", large_log(args.file_size).decode("utf-8")),
+        ("json", minified_json(args.file_size).decode("utf-8")),
+    ):
+        for mode in ("inline", "create", "executor"):
+            monitor = LoopMonitor(interval=0.001)
+            monitor.start()
+            await asyncio.sleep(0.01)
+
+            start = time.perf_counter()
+
+            if mode == "inline":
+                WrappedFilePaginator(content, max_size=1985, force_wrap=True)
+            else:
+                await WrappedFilePaginator.create(
+                    content,
+                    max_size=1985,
+                    force_wrap=True,
+                    max_blocking=args.max_blocking,
+                    executor=mode == "executor",
+                )
+
+            results[f"{corpus}_{mode}_latency"] = time.perf_counter() - start
+
+            await asyncio.sleep(0.01)
+            results[f"{corpus}_{mode}_max_lag"] = monitor.stop()["max_lag"]
+
+    return results
+
+
+async def run_scenario(name: str, args) -> dict:
+    http = FakeHTTP(
+        latency=args.latency,
+        jitter=args.jitter,
+        rate_limit=args.rate_limit,
+        retry_after=args.retry_after,
+    )
+    bot = FakeBot(http, asyncio.get_event_loop())
+
+    existing = asyncio.all_tasks()
+    monitor = LoopMonitor()
+    monitor.start()
+
+    try:
+        result = await SCENARIOS[name](bot, args)
+    finally:
+        loop_stats = monitor.stop()
+
+        # cancel every interface and reaction task the scenario left running
+        pending = asyncio.all_tasks() - existing
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    result.update(loop_stats)
+    result["rate_limited"] = http.rate_limited
+    return result
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.harness",
+        description="Run CodeToast end-to-end scenarios against a fake Discord.",
+    )
+    parser.add_argument("scenarios", nargs="*", default=list(SCENARIOS))
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--rate-limit", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=float, default=0.25)
+    parser.add_argument("--paginators", type=int, default=100)
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--presses", type=int, default=5)
+    parser.add_argument("--lines", type=int, default=2000)
+    parser.add_argument("--file-size", type=int, default=2 * 1024 * 1024)
+    parser.add_argument("--max-blocking", type=float, default=0.005)
+    parser.add_argument("--output", help="write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+
+    results = {}
+
+    try:
+        for name in args.scenarios:
+            results[name] = loop.run_until_complete(run_scenario(name, args))
+
+            print(name)
+            for key, value in results[name].items():
+                print(f"    {key:<32} {value:.4f}")
+    finally:
+        loop.close()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+
+import collections
+import glob
+import io
+import os
+import shutil
+import tarfile
+import typing
+import zipfile
+
+__all__ = (
+    "ARCHIVE_FORMATS",
+    "ArchiveResult",
+    "build_archive",
+    "expand_paths",
+)
+
+# archive flags accepted by toast cat, and the format they select
+ARCHIVE_FORMATS = {"zip": "zip", "tar": "tar.gz", "tar.gz": "tar.gz"}
+
+ArchiveResult = collections.namedtuple("ArchiveResult", "data included skipped")
+
+
+def expand_paths(
+    patterns: typing.Iterable[str], max_files: int = 1000
+) -> typing.List[str]:
+    """
+    Expands glob patterns and directories into a sorted, deduplicated list of at most
+    max_files regular files. Meant to be run in an executor.
+    """
+
+    paths = []
+    seen = set()
+
+    for pattern in patterns:
+        matches = (
+            glob.glob(pattern, recursive=True) if glob.has_magic(pattern) else [pattern]
+        )
+
+        for match in sorted(matches):
+            for candidate in walk_files(match):
+                key = os.path.realpath(candidate)
+
+                if key in seen or not os.path.isfile(candidate):
+                    continue
+
+                seen.add(key)
+                paths.append(candidate)
+
+                if len(paths) >= max_files:
+                    return paths
+
+    return paths
+
+
+def walk_files(path: str) -> typing.Iterator[str]:
+    if not os.path.isdir(path):
+        yield path
+        return
+
+    for root, directories, files in os.walk(path):
+        directories.sort()
+
+        for name in sorted(files):
+            yield os.path.join(root, name)
+
+
+def archive_names(paths: typing.List[str]) -> typing.List[str]:
+    """
+    Names each path relative to the directory the paths have in common.
+    """
+
+    absolute = [os.path.abspath(path) for path in paths]
+
+    if len(absolute) == 1:
+        return [os.path.basename(absolute[0])]
+
+    root = os.path.commonpath([os.path.dirname(path) for path in absolute])
+    return [os.path.relpath(path, root) for path in absolute]
+
+
+def build_archive(
+    paths: typing.List[str],
+    archive_format: str = "zip",
+    budget: int = 256 * 1024 * 1024,
+    limit: int = 8 * 1024 * 1024,
+    chunk_size: int = 1024 * 1024,
+) -> ArchiveResult:
+    """
+    Packs paths into an in-memory zip or tar.gz archive, streaming each file into it
+    chunk by chunk. Meant to be run in an executor.
+
+    Files that would take the total read past budget bytes, or that can't be read,
+    are skipped and returned with the reason. If the archive grows past limit bytes,
+    packing stops and data is None.
+    """
+
+    buffer = io.BytesIO()
+    included = []
+    skipped = []
+    total = 0
+
+    if archive_format == "zip":
+        archive = zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED)
+    else:
+        archive = tarfile.open(fileobj=buffer, mode="w:gz")
+
+    with archive:
+        for path, name in zip(paths, archive_names(paths)):
+            try:
+                size = os.path.getsize(path)
+
+                if total + size > budget:
+                    skipped.append((path, "over the size budget"))
+                    continue
+
+                with open(path, "rb") as source:
+                    if archive_format == "zip":
+                        with archive.open(name, "w", force_zip64=True) as target:
+                            shutil.copyfileobj(source, target, chunk_size)
+                    else:
+                        info = archive.gettarinfo(path, name)
+                        archive.addfile(info, source)
+            except OSError as exception:
+                skipped.append((path, exception.strerror or str(exception)))
+                continue
+
+            total += size
+            included.append((path, size))
+
+            if buffer.tell() > limit:
+                return ArchiveResult(None, included, skipped)
+
+    if buffer.tell() > limit:
+        return ArchiveResult(None, included, skipped)
+
+    return ArchiveResult(buffer.getvalue(), included, skipped)
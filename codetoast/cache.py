@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+
+import collections
+import typing
+
+from codetoast.paginators import TextPages
+
+__all__ = (
+    "CacheEntry",
+    "ContentCache",
+)
+
+
+CacheEntry = collections.namedtuple(
+    "CacheEntry", "validator data content language pages"
+)
+
+
+class ContentCache:
+    """
+    LRU cache of fetched or read content, bounded by the total size of what it holds.
+
+    Entries are looked up by a key (a path or URL) and are only considered fresh while
+    their validator matches, e.g. ``(mtime, size)`` for files or ``(etag, last_modified)``
+    for HTTP responses.
+    """
+
+    def __init__(self, max_size: int = 128 * 1024 * 1024):
+        self.max_size = max_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "collections.OrderedDict[typing.Hashable, CacheEntry]" = (
+            collections.OrderedDict()
+        )
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    @staticmethod
+    def entry_size(entry: CacheEntry) -> int:
+        size = len(entry.data or b"") + len(entry.content or "")
+
+        for pages in (entry.pages or {}).values():
+            if isinstance(pages, TextPages):
+                size += pages.footprint(shared=entry.content)
+            else:
+                size += sum(map(len, pages))
+
+        return size
+
+    def peek(self, key: typing.Hashable) -> typing.Optional[CacheEntry]:
+        return self._entries.get(key)
+
+    def get(
+        self, key: typing.Hashable, validator: typing.Any = None
+    ) -> typing.Optional[CacheEntry]:
+        entry = self._entries.get(key)
+
+        if entry is None or (validator is not None and entry.validator != validator):
+            if entry is not None:
+                self.invalidate(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: typing.Hashable, entry: CacheEntry) -> CacheEntry:
+        self.invalidate(key)
+
+        entry_size = self.entry_size(entry)
+
+        if entry_size > self.max_size:
+            return entry
+
+        self._entries[key] = entry
+        self.size += entry_size
+
+        while self.size > self.max_size:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= self.entry_size(evicted)
+
+        return entry
+
+    def store_pages(
+        self, key: typing.Hashable, span: typing.Any, pages: typing.Sequence[str]
+    ) -> typing.Optional[CacheEntry]:
+        entry = self._entries.get(key)
+
+        if entry is None:
+            return None
+
+        return self.put(
+            key,
+            entry._replace(
+                pages={
+                    **(entry.pages or {}),
+                    span: pages if isinstance(pages, TextPages) else tuple(pages),
+                }
+            ),
+        )
+
+    def invalidate(self, key: typing.Hashable):
+        entry = self._entries.pop(key, None)
+
+        if entry is not None:
+            self.size -= self.entry_size(entry)
+
+    def clear(self):
+        self._entries.clear()
+        self.size = 0
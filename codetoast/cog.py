@@ -4,13 +4,28 @@ from discord.ext import commands
 
 from codetoast.cogs.main import Main
 from codetoast.cogs.filesystem import FileSystem
+from codetoast.cogs.inspection import Inspection
+from codetoast.cogs.metrics import Metrics
+from codetoast.cogs.python import Python
+from codetoast.cogs.shards import Shards
+from codetoast.cogs.shell import Shell
+from codetoast.cogs.tasks import Tasks
 
 __all__ = (
     "CodeToast",
     "CodeToast_COMMANDS",
     "setup",
 )
-CodeToast_COMMANDS = (Main, FileSystem)
+CodeToast_COMMANDS = (
+    Main,
+    FileSystem,
+    Inspection,
+    Tasks,
+    Shards,
+    Python,
+    Shell,
+    Metrics,
+)
 
 
 class CodeToast(*CodeToast_COMMANDS):
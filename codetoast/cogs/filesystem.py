@@ -1,20 +1,189 @@
+import asyncio
+import collections
+import functools
+import glob
 import io
 import os
+import pathlib
 import re
+import time
+import typing
 import discord
 import aiohttp
+import humanize
 from discord.ext import commands
 
+from codetoast.archive import ARCHIVE_FORMATS, build_archive, expand_paths
+from codetoast.cache import CacheEntry, ContentCache
 from codetoast.cogs.base import BaseCog
-from codetoast.hljs import get_language, guess_file_traits
-from codetoast.paginators import PaginatorInterface, WrappedFilePaginator
+from codetoast.diffs import diff_data
+from codetoast.hljs import get_language, guess_file_traits, guess_language
+from codetoast.metrics import Histogram
+from codetoast.paginators import (
+    PaginatorInterface,
+    WrappedFilePaginator,
+    WrappedPaginator,
+)
+from codetoast.tracing import RequestTiming, create_trace_config
+from codetoast.utils import compress_payload
+
+CurlResult = collections.namedtuple(
+    "CurlResult", "url entry code hints latency timing error"
+)
 
 
 class FileSystem(BaseCog):
     __cat_line_regex = re.compile(r"(?:\.\/+)?(.+?)(?:#L?(\d+)(?:\-L?(\d+))?)?$")
 
+    compress_uploads: bool = True
+    curl_concurrency: int = 8
+    curl_timeout: float = 10.0
+    paginate_max_blocking: float = 0.005
+    paginate_in_executor: bool = False
+    archive_size_budget: int = 256 * 1024 * 1024
+    archive_max_files: int = 1000
+    diff_max_size: int = 4 * 1024 * 1024
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.content_cache = ContentCache()
+        # longest stretch each paginator built on the loop held it up for
+        self.paginate_blocking = Histogram(
+            (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+        )
+
+    @staticmethod
+    def filesize_threshold(ctx: commands.Context) -> int:
+        return (ctx.guild.filesize_limit if ctx.guild else 8 * 1024 * 1024) - 1024
+
+    async def send_compressed(
+        self, ctx: commands.Context, data: bytes, filename: str, content: str = None
+    ) -> bool:
+        if not self.compress_uploads:
+            return False
+
+        compressed = await ctx.bot.loop.run_in_executor(
+            None,
+            functools.partial(compress_payload, data, self.filesize_threshold(ctx)),
+        )
+
+        if compressed is None:
+            return False
+
+        payload, extension = compressed
+
+        await ctx.send(
+            content,
+            file=discord.File(
+                fp=io.BytesIO(payload), filename=f"{filename}.{extension}"
+            ),
+        )
+        return True
+
+    async def paginate_cached(
+        self, key, entry: CacheEntry, line_span=None, language_hints=()
+    ):
+        pages = (entry.pages or {}).get(line_span)
+
+        if pages is not None:
+            return WrappedFilePaginator.from_pages(pages, max_size=1985)
+
+        if entry.content is None:
+            content, _, file_language = await self.bot.loop.run_in_executor(
+                None, functools.partial(guess_file_traits, entry.data)
+            )
+            entry = entry._replace(
+                content=content, language=file_language or entry.language
+            )
+
+            if key in self.content_cache:
+                self.content_cache.put(key, entry)
+
+        paginator = await WrappedFilePaginator.create(
+            entry.content,
+            line_span=line_span,
+            language_hints=(entry.language or "", *language_hints),
+            max_blocking=self.paginate_max_blocking,
+            executor=self.paginate_in_executor,
+            loop=self.bot.loop,
+            max_size=1985,
+        )
+
+        self.paginate_blocking.observe(paginator.max_blocked)
+        self.content_cache.store_pages(key, line_span, paginator.pages)
+
+        return paginator
+
     @BaseCog.ToastCommand(prefix="toast", name="cat")
-    async def toast_cat(self, ctx: commands.Context, argument: str):
+    async def toast_cat(self, ctx: commands.Context, *arguments: str):
+        archive_format = next(
+            (
+                ARCHIVE_FORMATS[argument[2:]]
+                for argument in arguments
+                if argument[2:] in ARCHIVE_FORMATS and argument.startswith("--")
+            ),
+            None,
+        )
+        paths = [argument for argument in arguments if not argument.startswith("--")]
+
+        if not paths:
+            return await ctx.send("No paths were given.")
+
+        if (
+            archive_format is None
+            and len(paths) == 1
+            and not glob.has_magic(paths[0])
+            and not os.path.isdir(paths[0])
+        ):
+            return await self.cat_file(ctx, paths[0])
+
+        await self.cat_archive(ctx, paths, archive_format or "zip")
+
+    async def cat_archive(
+        self, ctx: commands.Context, patterns: typing.List[str], archive_format: str
+    ):
+        with self.submit(ctx):
+            paths = await ctx.bot.loop.run_in_executor(
+                None, functools.partial(expand_paths, patterns, self.archive_max_files)
+            )
+
+            if not paths:
+                return await ctx.send("No files matched.")
+
+            result = await ctx.bot.loop.run_in_executor(
+                None,
+                functools.partial(
+                    build_archive,
+                    paths,
+                    archive_format,
+                    self.archive_size_budget,
+                    self.filesize_threshold(ctx),
+                ),
+            )
+
+        total = humanize.naturalsize(
+            sum(size for _, size in result.included), binary=True
+        )
+        summary = [f"{len(result.included)} file(s), {total} before compression"]
+
+        for path, reason in result.skipped[:10]:
+            summary.append(f"Skipped `{path}`: {reason}")
+
+        if len(result.skipped) > 10:
+            summary.append(f"... and {len(result.skipped) - 10} more skipped")
+
+        if result.data is None:
+            summary[0] = f"The archive of {summary[0]} is too large to upload here."
+            return await ctx.send("\n".join(summary))
+
+        await ctx.send(
+            "\n".join(summary),
+            file=discord.File(
+                fp=io.BytesIO(result.data), filename=f"files.{archive_format}"
+            ),
+        )
+
+    async def cat_file(self, ctx: commands.Context, argument: str):
         match = self.__cat_line_regex.search(argument)
 
         if not match:
@@ -31,7 +200,8 @@ class FileSystem(BaseCog):
         if not os.path.exists(path) or os.path.isdir(path):
             return await ctx.send(f"`{path}`: The file could not be found")
 
-        size = os.path.getsize(path)
+        stat = os.stat(path)
+        size = stat.st_size
 
         if size <= 0:
             return await ctx.send(
@@ -42,10 +212,33 @@ class FileSystem(BaseCog):
         if size > 50 * (1024 ** 2):
             return await ctx.send(f"`{path}`: Cowardly refusing to read a file >50MB.")
 
+        validator = (stat.st_mtime_ns, size)
+        entry = self.content_cache.get(path, validator)
+
+        if entry is None:
+            data = await ctx.bot.loop.run_in_executor(
+                None, pathlib.Path(path).read_bytes
+            )
+
+            entry = self.content_cache.put(
+                path, CacheEntry(validator, data, None, get_language(path), None)
+            )
+
+        if line_span is None and len(entry.data) < self.filesize_threshold(ctx):
+            return await ctx.send(
+                f"`{str(path)}`",
+                file=discord.File(
+                    fp=io.BytesIO(entry.data), filename=os.path.basename(path)
+                ),
+            )
+
+        if line_span is None and await self.send_compressed(
+            ctx, entry.data, os.path.basename(path), f"`{str(path)}`"
+        ):
+            return
+
         try:
-            with open(path, "rb") as file:
-                data = file.read()
-                await ctx.send(f"`{str(path)}`", file=discord.File(str(path)))
+            paginator = await self.paginate_cached(path, entry, line_span)
 
         except UnicodeDecodeError:
             return await ctx.send(
@@ -53,30 +246,44 @@ class FileSystem(BaseCog):
             )
 
         except ValueError as exc:
-            error_string = io.StringIO(str(exe))
+            error_string = io.BytesIO(str(exc).encode("utf-8"))
             return await ctx.send(
                 f"`{path}`: Couldn't read this file",
                 file=discord.File(fp=error_string, filename="error.txt"),
             )
 
-    @BaseCog.ToastCommand(prefix="toast", name="curl")
-    async def toast_curl(self, ctx: commands.Context, url: str):
-        url = url.lstrip("<").rstrip(">")
+        interface = PaginatorInterface(ctx.bot, paginator, owner=ctx.author)
+        await interface.send_to(ctx)
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                data = await response.read()
-                hints = (response.content_type, url)
-                code = response.status
+    async def fetch_cached(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        timing: RequestTiming = None,
+    ):
+        cached = self.content_cache.peek(url)
+        headers = {}
 
-            if not data:
-                return await ctx.send(f"HTTP response was empty (status code {code}).")
+        if cached is not None:
+            etag, last_modified = cached.validator
 
-            filesize_threshold = (
-                ctx.guild.filesize_limit if ctx.guild else 8 * 1024 * 1024
-            ) - 1024
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
 
-            if len(data) < filesize_threshold:
+        async with session.get(
+            url, headers=headers, trace_request_ctx=timing
+        ) as response:
+            hints = (response.content_type, url)
+            code = response.status
+
+            if code == 304 and cached is not None:
+                entry = self.content_cache.get(url) or self.content_cache.put(
+                    url, cached
+                )
+            else:
+                data = await response.read()
                 language = None
 
                 for hint in hints:
@@ -85,24 +292,231 @@ class FileSystem(BaseCog):
                     if language:
                         break
 
-                await ctx.send(
-                    file=discord.File(
-                        filename=f"response.{language or 'txt'}", fp=io.BytesIO(data)
-                    )
+                language = language or guess_language(data)
+
+                validator = (
+                    response.headers.get("ETag"),
+                    response.headers.get("Last-Modified"),
                 )
+                entry = CacheEntry(validator, data, None, language, None)
+
+                if code == 200 and any(validator):
+                    self.content_cache.put(url, entry)
+                else:
+                    self.content_cache.invalidate(url)
+
+            if timing is not None:
+                timing.end = time.perf_counter()
+
+        return entry, code, hints
+
+    async def send_response(
+        self, ctx: commands.Context, url: str, entry: CacheEntry, code: int, hints=()
+    ):
+        if not entry.data:
+            return await ctx.send(f"HTTP response was empty (status code {code}).")
+
+        if len(entry.data) < self.filesize_threshold(ctx):
+            await ctx.send(
+                file=discord.File(
+                    filename=f"response.{entry.language or 'txt'}",
+                    fp=io.BytesIO(entry.data),
+                )
+            )
+        elif not await self.send_compressed(
+            ctx, entry.data, f"response.{entry.language or 'txt'}"
+        ):
+            try:
+                paginator = await self.paginate_cached(url, entry, language_hints=hints)
+            except UnicodeDecodeError:
+                return await ctx.send(
+                    f"Couldn't determine the encoding of the response. (status code {code})"
+                )
+            except ValueError as exc:
+                return await ctx.send(
+                    f"Couldn't read response (status code {code}), {exc}"
+                )
+
+            interface = PaginatorInterface(ctx.bot, paginator, owner=ctx.author)
+            await interface.send_to(ctx)
+
+    async def fetch_timed(
+        self,
+        session: aiohttp.ClientSession,
+        semaphore: asyncio.Semaphore,
+        url: str,
+        timed: bool = False,
+    ) -> CurlResult:
+        async with semaphore:
+            timing = RequestTiming() if timed else None
+            start = time.perf_counter()
+
+            try:
+                entry, code, hints = await asyncio.wait_for(
+                    self.fetch_cached(session, url, timing), timeout=self.curl_timeout
+                )
+            except asyncio.TimeoutError:
+                return CurlResult(
+                    url,
+                    None,
+                    None,
+                    (),
+                    time.perf_counter() - start,
+                    timing,
+                    "timed out",
+                )
+            except aiohttp.ClientError as exc:
+                return CurlResult(
+                    url, None, None, (), time.perf_counter() - start, timing, str(exc)
+                )
+
+            return CurlResult(
+                url, entry, code, hints, time.perf_counter() - start, timing, None
+            )
+
+    @BaseCog.ToastCommand(prefix="toast", name="curl")
+    async def toast_curl(self, ctx: commands.Context, *urls: str):
+        send_bodies = "--bodies" in urls
+        timed = "--timing" in urls
+        urls = [
+            url.lstrip("<").rstrip(">")
+            for url in urls
+            if url not in ("--bodies", "--timing")
+        ]
+
+        if not urls:
+            return await ctx.send("No URLs were given.")
+
+        trace_configs = [create_trace_config()] if timed else None
+
+        if len(urls) == 1:
+            timing = RequestTiming() if timed else None
+
+            async with aiohttp.ClientSession(trace_configs=trace_configs) as session:
+                entry, code, hints = await self.fetch_cached(session, urls[0], timing)
+
+            if timing is not None:
+                await ctx.send(f"Status code {code}: {timing.summary()}")
+
+            return await self.send_response(ctx, urls[0], entry, code, hints)
+
+        semaphore = asyncio.Semaphore(self.curl_concurrency)
+
+        async with aiohttp.ClientSession(trace_configs=trace_configs) as session:
+            results = await asyncio.gather(
+                *(self.fetch_timed(session, semaphore, url, timed) for url in urls)
+            )
+
+        paginator = WrappedPaginator(prefix="```", max_size=1985)
+        paginator.add_line(f"{'STATUS':<10}{'SIZE':>12}{'LATENCY':>12}  URL")
+
+        for result in results:
+            if result.error:
+                status = "ERR"
+                size = "-"
             else:
-                try:
-                    paginator = WrappedFilePaginator(
-                        io.BytesIO(data), language_hints=hints, max_size=1985
-                    )
-                except UnicodeDecodeError:
-                    return await ctx.send(
-                        f"Couldn't determine the encoding of the response. (status code {code})"
+                status = str(result.code)
+                size = humanize.naturalsize(len(result.entry.data), binary=True)
+
+            paginator.add_line(
+                f"{status:<10}{size:>12}{result.latency * 1000:>10.0f}ms  {result.url}"
+            )
+
+            if result.error:
+                paginator.add_line(f"{'':<10}{result.error}")
+            elif result.timing is not None:
+                paginator.add_line(f"{'':<10}{result.timing.summary()}")
+
+        interface = PaginatorInterface(ctx.bot, paginator, owner=ctx.author)
+        await interface.send_to(ctx)
+
+        if send_bodies:
+            for result in results:
+                if not result.error:
+                    await ctx.send(f"`{result.url}`")
+                    await self.send_response(
+                        ctx, result.url, result.entry, result.code, result.hints
                     )
-                except ValueError as exc:
-                    return await ctx.send(
-                        f"Couldn't read response (status code {code}), {exc}"
+
+    async def read_bounded(
+        self, session: aiohttp.ClientSession, source: str, limit: int
+    ) -> bytes:
+        """
+        Reads a path or URL, refusing anything larger than limit bytes. Responses are
+        streamed, so an oversized one is abandoned without being read in full.
+        """
+
+        if source.startswith(("http://", "https://")):
+            async with session.get(source) as response:
+                if response.content_length and response.content_length > limit:
+                    raise ValueError(f"`{source}` is larger than {limit} bytes")
+
+                chunks = []
+                size = 0
+
+                async for chunk in response.content.iter_chunked(64 * 1024):
+                    size += len(chunk)
+
+                    if size > limit:
+                        raise ValueError(f"`{source}` is larger than {limit} bytes")
+
+                    chunks.append(chunk)
+
+                return b"".join(chunks)
+
+        if not os.path.isfile(source):
+            raise ValueError(f"`{source}`: The file could not be found")
+
+        if os.path.getsize(source) > limit:
+            raise ValueError(f"`{source}` is larger than {limit} bytes")
+
+        return await self.bot.loop.run_in_executor(
+            None, pathlib.Path(source).read_bytes
+        )
+
+    @BaseCog.ToastCommand(prefix="toast", name="diff")
+    async def toast_diff(self, ctx: commands.Context, first: str, second: str):
+        first = first.lstrip("<").rstrip(">")
+        second = second.lstrip("<").rstrip(">")
+
+        with self.submit(ctx):
+            try:
+                async with aiohttp.ClientSession(
+                    timeout=aiohttp.ClientTimeout(total=self.curl_timeout)
+                ) as session:
+                    first_data, second_data = await asyncio.gather(
+                        self.read_bounded(session, first, self.diff_max_size),
+                        self.read_bounded(session, second, self.diff_max_size),
                     )
 
-                interface = PaginatorInterface(ctx.bot, paginator, owner=ctx.author)
-                await interface.send_to(ctx)
+                lines = await ctx.bot.loop.run_in_executor(
+                    None,
+                    functools.partial(
+                        diff_data, first_data, second_data, first, second
+                    ),
+                )
+            except UnicodeDecodeError:
+                return await ctx.send("Couldn't determine the encoding of the inputs.")
+            except ValueError as exc:
+                return await ctx.send(str(exc))
+            except (OSError, aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                return await ctx.send(
+                    f"Couldn't read the inputs: {str(exc) or type(exc).__name__}"
+                )
+
+            if not lines:
+                return await ctx.send("No differences.")
+
+            paginator = await WrappedFilePaginator.create(
+                "\n".join(lines),
+                language_hints=("diff",),
+                max_blocking=self.paginate_max_blocking,
+                executor=self.paginate_in_executor,
+                loop=self.bot.loop,
+                max_size=1985,
+                force_wrap=True,
+            )
+            self.paginate_blocking.observe(paginator.max_blocked)
+
+        interface = PaginatorInterface(ctx.bot, paginator, owner=ctx.author)
+        await interface.send_to(ctx)
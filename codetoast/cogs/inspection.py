@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import functools
+import inspect
+
+import humanize
+from discord.ext import commands
+
+from codetoast.cogs.base import BaseCog
+from codetoast.inspections import deep_sizeof, inspect_lines
+from codetoast.paginators import PaginatorInterface, WrappedPaginator
+from codetoast.utils import get_var_dict_from_ctx, strip_codeblock
+
+
+class Inspection(BaseCog):
+    inspect_depth: int = 2
+    inspect_breadth: int = 25
+    deep_size_budget: float = 2.0
+
+    @BaseCog.ToastCommand(prefix="toast", name="inspect")
+    async def toast_inspect(self, ctx: commands.Context, *, argument: str):
+        deep = argument.startswith("--deep ")
+
+        if deep:
+            argument = argument[len("--deep ") :]
+
+        argument = strip_codeblock(argument)
+
+        with self.submit(ctx):
+            try:
+                result = eval(  # pylint: disable=eval-used
+                    compile(argument, "<inspect>", "eval"), get_var_dict_from_ctx(ctx)
+                )
+
+                if inspect.isawaitable(result):
+                    result = await result
+            except Exception as exception:  # pylint: disable=broad-except
+                return await ctx.send(f"`{type(exception).__name__}: {exception}`")
+
+            lines = inspect_lines(result, self.inspect_depth, self.inspect_breadth)
+
+            paginator = WrappedPaginator(prefix="```", max_size=1985, force_wrap=True)
+
+            for line in lines:
+                paginator.add_line(line)
+
+                if paginator._pages:  # pylint: disable=protected-access
+                    break
+
+            interface = PaginatorInterface(ctx.bot, paginator, owner=ctx.author)
+            await interface.send_to(ctx)
+
+            for index, line in enumerate(lines):
+                await interface.add_line(line)
+
+                if index % 25 == 0:
+                    await asyncio.sleep(0)
+
+            if deep:
+                size = await ctx.bot.loop.run_in_executor(
+                    None,
+                    functools.partial(deep_sizeof, result, self.deep_size_budget),
+                )
+
+                await interface.add_line("")
+                await interface.add_line(
+                    f"deep size: {humanize.naturalsize(size.size, binary=True)}"
+                    f" over {size.count} objects"
+                    + (
+                        ""
+                        if size.complete
+                        else f" (stopped after {self.deep_size_budget}s, partial)"
+                    )
+                )
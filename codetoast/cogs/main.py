@@ -87,3 +87,24 @@ class Main(BaseCog):
         )
 
         await ctx.send("\n".join(summary))
+
+    @BaseCog.ToastCommand(prefix="toast", name="cancel")
+    async def toast_cancel(self, ctx: commands.Context, index: int = -1):
+        if not self.tasks:
+            return await ctx.send("No tasks to cancel.")
+
+        if index == -1:
+            cmdtask = self.tasks[-1]
+        else:
+            cmdtask = next((task for task in self.tasks if task.index == index), None)
+
+            if cmdtask is None:
+                return await ctx.send(f"Unknown task {index}.")
+
+        if cmdtask.task is None:
+            return await ctx.send(f"Task {cmdtask.index} has no task to cancel.")
+
+        cmdtask.task.cancel()
+        await ctx.send(
+            f"Cancelled task {cmdtask.index}: `{cmdtask.ctx.command.qualified_name}`"
+        )
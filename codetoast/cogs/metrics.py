@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+
+import collections
+import time
+import weakref
+
+from discord.ext import commands
+
+from codetoast.cogs.base import BaseCog
+from codetoast.metrics import Histogram, Metric, MetricsServer, render_metrics
+from codetoast.paginators import (
+    INTERFACE_CALLS,
+    PaginatorInterface,
+    WrappedPaginator,
+)
+
+
+class Metrics(BaseCog):
+    metrics_host: str = "127.0.0.1"
+    metrics_port: int = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.command_latency = collections.defaultdict(Histogram)
+        self.command_starts: "weakref.WeakKeyDictionary[commands.Context, float]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self.metrics_server: MetricsServer = None
+
+        if self.metrics_port is not None:
+            self.bot.loop.create_task(self.start_metrics_server(self.metrics_port))
+
+    def cog_unload(self):
+        if self.metrics_server is not None:
+            self.bot.loop.create_task(self.metrics_server.stop())
+        super().cog_unload()
+
+    async def cog_before_invoke(self, ctx: commands.Context):
+        self.command_starts[ctx] = time.perf_counter()
+
+    async def cog_after_invoke(self, ctx: commands.Context):
+        start = self.command_starts.pop(ctx, None)
+
+        if start is not None:
+            self.command_latency[ctx.command.qualified_name].observe(
+                time.perf_counter() - start
+            )
+
+    async def start_metrics_server(self, port: int):
+        if self.metrics_server is not None:
+            await self.metrics_server.stop()
+
+        self.metrics_server = MetricsServer(
+            self.collect_metrics, self.metrics_host, port
+        )
+
+        try:
+            await self.metrics_server.start()
+        except BaseException:
+            self.metrics_server = None
+            raise
+
+    def collect_metrics(self):
+        metrics = [
+            Metric(
+                "codetoast_open_paginators",
+                "gauge",
+                "Paginator interfaces still responding to reactions.",
+                [({}, PaginatorInterface.open_interfaces())],
+            ),
+            Metric(
+                "codetoast_paginator_calls_total",
+                "counter",
+                "Discord API calls made by paginator interfaces.",
+                [({"call": call}, count) for call, count in INTERFACE_CALLS.items()],
+            ),
+            Metric(
+                "codetoast_running_tasks",
+                "gauge",
+                "CodeToast commands currently running.",
+                [({}, len(self.tasks))],
+            ),
+            Metric(
+                "codetoast_tasks_total",
+                "counter",
+                "CodeToast commands started.",
+                [({}, self.task_count)],
+            ),
+            Metric(
+                "codetoast_command_duration_seconds",
+                "histogram",
+                "Time taken by CodeToast commands.",
+                [
+                    sample
+                    for name, histogram in sorted(self.command_latency.items())
+                    for sample in histogram.samples({"command": name})
+                ],
+            ),
+        ]
+
+        content_cache = getattr(self, "content_cache", None)
+
+        if content_cache is not None:
+            metrics.extend(
+                (
+                    Metric(
+                        "codetoast_cache_requests_total",
+                        "counter",
+                        "Content cache lookups by result.",
+                        [
+                            ({"result": "hit"}, content_cache.hits),
+                            ({"result": "miss"}, content_cache.misses),
+                        ],
+                    ),
+                    Metric(
+                        "codetoast_cache_entries",
+                        "gauge",
+                        "Entries held by the content cache.",
+                        [({}, len(content_cache))],
+                    ),
+                    Metric(
+                        "codetoast_cache_size_bytes",
+                        "gauge",
+                        "Approximate size of the content cache.",
+                        [({}, content_cache.size)],
+                    ),
+                )
+            )
+
+        paginate_blocking = getattr(self, "paginate_blocking", None)
+
+        if paginate_blocking is not None:
+            metrics.append(
+                Metric(
+                    "codetoast_paginate_blocking_seconds",
+                    "histogram",
+                    "Longest time a file paginator held up the event loop while"
+                    " adding pages.",
+                    list(paginate_blocking.samples({})),
+                )
+            )
+
+        return metrics
+
+    @BaseCog.ToastCommand(prefix="toast", name="metrics")
+    async def toast_metrics(self, ctx: commands.Context, port: int = None):
+        if port is not None:
+            with self.submit(ctx):
+                await self.start_metrics_server(port)
+
+        paginator = WrappedPaginator(prefix="```", max_size=1985, force_wrap=True)
+
+        if self.metrics_server is not None:
+            paginator.add_line(
+                f"Serving http://{self.metrics_server.host}:{self.metrics_server.port}"
+                f"/metrics"
+            )
+        else:
+            paginator.add_line("The metrics endpoint is not running.")
+
+        paginator.add_line("")
+
+        for line in render_metrics(self.collect_metrics()).splitlines():
+            paginator.add_line(line)
+
+        interface = PaginatorInterface(ctx.bot, paginator, owner=ctx.author)
+        await interface.send_to(ctx)
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+
+import functools
+import time
+
+from discord.ext import commands
+
+from codetoast.cogs.base import BaseCog
+from codetoast.paginators import PaginatorInterface, WrappedPaginator
+from codetoast.repl import CPUTimer, LineStream, execute, format_exception
+from codetoast.utils import get_var_dict_from_ctx, strip_codeblock
+
+
+class Python(BaseCog):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.last_result = None
+
+    @BaseCog.ToastCommand(prefix="toast", name="py", aliases=["python"])
+    async def toast_py(self, ctx: commands.Context, *, argument: str):
+        source = strip_codeblock(argument)
+
+        paginator = WrappedPaginator(prefix="```py", max_size=1985, force_wrap=True)
+        paginator.add_line(f">>> {source.splitlines()[0] if source else ''}")
+
+        interface = PaginatorInterface(ctx.bot, paginator, owner=ctx.author)
+        stream = LineStream(interface.add_line_nowait)
+        timer = CPUTimer()
+
+        scope = get_var_dict_from_ctx(ctx)
+        scope["_"] = self.last_result
+        scope["print"] = functools.partial(print, file=stream)
+
+        async def add_result(result):
+            self.last_result = result
+            stream.flush()
+
+            for line in (result if isinstance(result, str) else repr(result)).split(
+                "\n"
+            ):
+                interface.add_line_nowait(line)
+
+        with self.submit(ctx):
+            await interface.send_to(ctx)
+            start = time.perf_counter()
+
+            try:
+                await execute(source, scope, timer, add_result)
+            except Exception as exception:  # pylint: disable=broad-except
+                stream.flush()
+
+                for line in format_exception(exception):
+                    interface.add_line_nowait(line)
+            finally:
+                stream.flush()
+                interface.add_line_nowait(
+                    f"# wall {(time.perf_counter() - start) * 1000:.2f}ms,"
+                    f" cpu {timer.cpu * 1000:.2f}ms"
+                )
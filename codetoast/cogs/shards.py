@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+
+import collections
+import functools
+import itertools
+import statistics
+
+import discord
+import humanize
+from discord.ext import commands
+
+from codetoast.cogs.base import BaseCog
+from codetoast.gateway import RollingCounter, shard_for_guild
+from codetoast.inspections import estimate_sizes
+from codetoast.paginators import (
+    PaginatorEmbedInterface,
+    PaginatorInterface,
+    WrappedPaginator,
+)
+
+CACHE_CATEGORIES = ("guilds", "members", "channels", "emojis", "messages")
+
+
+class Shards(BaseCog):
+    cache_sample_size: int = 200
+    event_window: float = 300.0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.event_counter: RollingCounter = None
+        self.shard_latencies = collections.defaultdict(
+            lambda: collections.deque(maxlen=64)
+        )
+        self.shard_connections = collections.defaultdict(collections.Counter)
+        self.last_latencies = {}
+
+    def cog_unload(self):
+        if self.event_counter is not None:
+            self.bot.remove_listener(self.track_socket_response, "on_socket_response")
+        super().cog_unload()
+
+    @property
+    def auto_sharded(self) -> bool:
+        return isinstance(self.bot, discord.AutoShardedClient)
+
+    @property
+    def latencies(self):
+        if self.auto_sharded:
+            return self.bot.latencies
+        return [(self.bot.shard_id or 0, self.bot.latency)]
+
+    def start_event_tracking(self):
+        # Only listen to every gateway event once someone asks for the dashboard, as
+        # discord.py schedules a task per listener for every event it dispatches.
+        if self.event_counter is None:
+            self.event_counter = RollingCounter(self.event_window)
+            self.last_latencies = {
+                shard or 0: latency for shard, latency in self.latencies
+            }
+            self.bot.add_listener(self.track_socket_response, "on_socket_response")
+
+    async def track_socket_response(self, msg: dict):
+        event = msg.get("t")
+
+        if event is None:
+            if msg.get("op") == 11:  # HEARTBEAT_ACK
+                # The payload doesn't say which shard acked, but only that shard's
+                # latency changes, so only changed latencies are recorded.
+                for shard, latency in self.latencies:
+                    shard = shard or 0
+
+                    if self.last_latencies.get(shard) != latency:
+                        self.last_latencies[shard] = latency
+                        self.shard_latencies[shard].append(latency)
+            return
+
+        data = msg.get("d")
+        guild_id = data.get("guild_id") if isinstance(data, dict) else None
+        shard = shard_for_guild(guild_id, self.bot.shard_count) if guild_id else None
+
+        self.event_counter.add((shard, event))
+
+    @commands.Cog.listener()
+    async def on_shard_connect(self, shard_id: int):
+        self.shard_connections[shard_id]["connects"] += 1
+
+    @commands.Cog.listener()
+    async def on_shard_disconnect(self, shard_id: int):
+        self.shard_connections[shard_id]["disconnects"] += 1
+
+    @commands.Cog.listener()
+    async def on_shard_resumed(self, shard_id: int):
+        self.shard_connections[shard_id]["resumes"] += 1
+
+    @commands.Cog.listener()
+    async def on_connect(self):
+        if not self.auto_sharded:
+            self.shard_connections[self.bot.shard_id or 0]["connects"] += 1
+
+    @commands.Cog.listener()
+    async def on_disconnect(self):
+        if not self.auto_sharded:
+            self.shard_connections[self.bot.shard_id or 0]["disconnects"] += 1
+
+    @commands.Cog.listener()
+    async def on_resumed(self):
+        if not self.auto_sharded:
+            self.shard_connections[self.bot.shard_id or 0]["resumes"] += 1
+
+    def collect_cache_counts(self):
+        """
+        Counts cached objects per shard and takes a small sample of each category.
+
+        This runs on the event loop so the caches can't change underneath it, and so it
+        only uses len() and bounded slices rather than copying any cache. The message
+        cache is walked in full, as it is already capped by max_messages.
+        """
+
+        # pylint: disable=protected-access
+        counts = collections.defaultdict(collections.Counter)
+        samples = {category: [] for category in CACHE_CATEGORIES}
+
+        guilds = self.bot.guilds
+        per_guild = max(1, self.cache_sample_size // max(1, len(guilds)))
+
+        for guild in guilds:
+            shard = guild.shard_id or 0
+            members = getattr(guild, "_members", {})
+            channels = getattr(guild, "_channels", {})
+
+            counts[shard]["guilds"] += 1
+            counts[shard]["members"] += len(members)
+            counts[shard]["channels"] += len(channels)
+            counts[shard]["emojis"] += len(guild.emojis)
+
+            if len(samples["guilds"]) < self.cache_sample_size:
+                samples["guilds"].append(guild)
+            if len(samples["members"]) < self.cache_sample_size:
+                samples["members"].extend(itertools.islice(members.values(), per_guild))
+            if len(samples["channels"]) < self.cache_sample_size:
+                samples["channels"].extend(
+                    itertools.islice(channels.values(), per_guild)
+                )
+            if len(samples["emojis"]) < self.cache_sample_size:
+                samples["emojis"].extend(guild.emojis[:per_guild])
+
+        for message in self.bot.cached_messages:
+            guild = message.guild
+            counts[(guild.shard_id or 0) if guild else 0]["messages"] += 1
+
+            if len(samples["messages"]) < self.cache_sample_size:
+                samples["messages"].append(message)
+
+        users = getattr(self.bot._connection, "_users", {})
+        samples["users"] = list(
+            itertools.islice(users.values(), self.cache_sample_size)
+        )
+
+        return counts, samples, len(users)
+
+    @BaseCog.ToastCommand(prefix="toast", name="cache")
+    async def toast_cache(self, ctx: commands.Context):
+        with self.submit(ctx):
+            counts, samples, users = self.collect_cache_counts()
+
+            sizes = await ctx.bot.loop.run_in_executor(
+                None, functools.partial(estimate_sizes, samples)
+            )
+
+        paginator = WrappedPaginator(prefix="```", max_size=1985)
+        paginator.add_line(
+            f"Approximate cache footprint from samples of up to"
+            f" {self.cache_sample_size} objects per category."
+        )
+        paginator.add_line(
+            f"{users} user(s) are cached globally,"
+            f" ~{humanize.naturalsize(users * sizes['users'], binary=True)}"
+            f" ({sizes['users']:.0f} B each)."
+        )
+
+        total = users * sizes["users"]
+
+        for shard in sorted(counts):
+            paginator.add_line("")
+            paginator.add_line(f"Shard {shard}:")
+
+            for category in CACHE_CATEGORIES:
+                count = counts[shard][category]
+                estimate = count * sizes[category]
+                total += estimate
+
+                paginator.add_line(
+                    f"  {category:<10}{count:>12}"
+                    f"  ~{humanize.naturalsize(estimate, binary=True):>12}"
+                    f"  ({sizes[category]:.0f} B each)"
+                )
+
+        paginator.add_line("")
+        paginator.add_line(
+            f"Total: ~{humanize.naturalsize(total, binary=True)}"
+            f" (object graphs shared between models are not counted)"
+        )
+
+        interface = PaginatorInterface(ctx.bot, paginator, owner=ctx.author)
+        await interface.send_to(ctx)
+
+    @BaseCog.ToastCommand(prefix="toast", name="shards")
+    async def toast_shards(self, ctx: commands.Context):
+        first_run = self.event_counter is None
+        self.start_event_tracking()
+
+        totals, covered = self.event_counter.totals()
+
+        per_shard = collections.defaultdict(collections.Counter)
+        for (shard, event), count in totals.items():
+            per_shard[shard][event] += count
+
+        paginator = WrappedPaginator(prefix="```", max_size=1985)
+
+        if first_run:
+            paginator.add_line(
+                "Event tracking has just started; run this again for event rates."
+            )
+        else:
+            paginator.add_line(
+                f"Event rates over the last {covered:.0f}s"
+                f" (window {self.event_window:.0f}s)."
+            )
+
+        for shard, latency in sorted(self.latencies, key=lambda pair: pair[0] or 0):
+            shard = shard or 0
+            history = self.shard_latencies[shard]
+            connections = self.shard_connections[shard]
+            events = per_shard.get(shard, collections.Counter())
+
+            paginator.add_line("")
+            paginator.add_line(
+                f"Shard {shard}: heartbeat {latency * 1000:.1f}ms"
+                + (
+                    f" (median {statistics.median(history) * 1000:.1f}ms,"
+                    f" max {max(history) * 1000:.1f}ms over {len(history)} acks)"
+                    if history
+                    else ""
+                )
+            )
+            paginator.add_line(
+                f"  {connections['connects']} connect(s),"
+                f" {connections['resumes']} resume(s),"
+                f" {connections['disconnects']} disconnect(s);"
+                f" {sum(events.values()) / covered:.2f} guild events/s"
+            )
+
+            for event, count in events.most_common(5):
+                paginator.add_line(f"    {event:<28}{count / covered:>10.2f}/s")
+
+        unsharded = per_shard.get(None)
+        if unsharded:
+            paginator.add_line("")
+            paginator.add_line(
+                f"Events without a guild: {sum(unsharded.values()) / covered:.2f}/s"
+            )
+
+            for event, count in unsharded.most_common(5):
+                paginator.add_line(f"    {event:<28}{count / covered:>10.2f}/s")
+
+        interface = PaginatorEmbedInterface(
+            ctx.bot,
+            paginator,
+            owner=ctx.author,
+            embed=discord.Embed(title="Shards"),
+        )
+        await interface.send_to(ctx)
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import time
+
+from discord.ext import commands
+
+from codetoast.cogs.base import BaseCog
+from codetoast.paginators import PaginatorInterface, WrappedPaginator
+from codetoast.repl import LineStream
+from codetoast.shell import run_shell
+from codetoast.utils import strip_codeblock
+
+
+class Shell(BaseCog):
+    shell_output_limit: int = 1024 * 1024
+    shell_timeout: float = 300.0
+
+    @BaseCog.ToastCommand(prefix="toast", name="sh", aliases=["shell"])
+    async def toast_sh(self, ctx: commands.Context, *, argument: str):
+        command = strip_codeblock(argument)
+
+        paginator = WrappedPaginator(prefix="```sh", max_size=1985, force_wrap=True)
+        paginator.add_line(f"$ {command}")
+
+        interface = PaginatorInterface(ctx.bot, paginator, owner=ctx.author)
+        stream = LineStream(interface.add_line_nowait)
+
+        with self.submit(ctx) as cmdtask:
+            await interface.send_to(ctx)
+            start = time.perf_counter()
+
+            try:
+                result = await run_shell(
+                    command,
+                    stream.write,
+                    output_limit=self.shell_output_limit,
+                    timeout=self.shell_timeout,
+                )
+            except asyncio.CancelledError:
+                stream.flush()
+                interface.add_line_nowait(f"[cancelled as task {cmdtask.index}]")
+                raise
+            except Exception as exception:  # pylint: disable=broad-except
+                stream.flush()
+                interface.add_line_nowait(
+                    f"[failed: {type(exception).__name__}: {exception}]"
+                )
+                return
+
+            stream.flush()
+            interface.add_line_nowait(
+                f"[{result.stopped or 'exited'} with status {result.returncode}"
+                f" after {time.perf_counter() - start:.2f}s]"
+            )
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+
+from discord.ext import commands
+
+from codetoast.cogs.base import BaseCog
+from codetoast.paginators import PaginatorInterface, WrappedPaginator
+from codetoast.tasks import TaskTracker
+
+
+class Tasks(BaseCog):
+    stuck_threshold: float = 30.0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.task_tracker = TaskTracker()
+        self.task_tracker.install(self.bot.loop)
+        self.task_tracker.start_sampling()
+
+    def cog_unload(self):
+        self.task_tracker.uninstall()
+        super().cog_unload()
+
+    @BaseCog.ToastCommand(prefix="toast", name="tasks")
+    async def toast_tasks(self, ctx: commands.Context, *options: str):
+        sampler = self.task_tracker.sampler
+        first_run = sampler is None or sampler.done()
+        self.task_tracker.start_sampling()
+
+        sort = next(
+            (option for option in options if option in ("age", "idle", "name")), "idle"
+        )
+        dump_stuck = "--stuck" in options
+
+        with self.submit(ctx):
+            infos = self.task_tracker.sample()
+
+        if sort == "name":
+            infos.sort(key=lambda info: info.coroutine)
+        else:
+            infos.sort(key=lambda info: getattr(info, sort), reverse=True)
+
+        paginator = WrappedPaginator(prefix="```", max_size=1985, force_wrap=True)
+
+        if first_run:
+            paginator.add_line(
+                f"{len(infos)} task(s), sorted by {sort}; sampling has just started,"
+                " run this again for idle times"
+            )
+        else:
+            paginator.add_line(
+                f"{len(infos)} task(s), sorted by {sort}; idle is the time since the"
+                f" await point last changed, sampled every"
+                f" {self.task_tracker.sample_interval}s"
+            )
+        paginator.add_line("")
+        paginator.add_line(f"{'AGE':>9} {'IDLE':>9}  COROUTINE / AWAITING")
+
+        for info in infos:
+            paginator.add_line(
+                f"{info.age:>8.1f}s {info.idle:>8.1f}s  {info.coroutine} ({info.name})"
+            )
+            paginator.add_line(f"{'':>20}  {info.location}")
+
+        if dump_stuck and not first_run:
+            stuck = [info for info in infos if info.idle >= self.stuck_threshold]
+
+            paginator.add_line("")
+            paginator.add_line(
+                f"{len(stuck)} task(s) idle for at least {self.stuck_threshold}s:"
+            )
+
+            for info in stuck:
+                paginator.add_line("")
+                paginator.add_line(
+                    f"{info.coroutine} ({info.name}), idle {info.idle:.1f}s"
+                )
+
+                for line in self.task_tracker.format_stack(info.task):
+                    paginator.add_line(line)
+
+        interface = PaginatorInterface(ctx.bot, paginator, owner=ctx.author)
+        await interface.send_to(ctx)
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+
+import difflib
+import typing
+
+from codetoast.hljs import guess_file_traits
+
+__all__ = (
+    "diff_data",
+    "unified_diff",
+)
+
+
+def common_affixes(a: typing.List[str], b: typing.List[str]) -> typing.Tuple[int, int]:
+    """
+    Returns how many lines a and b share at their start and, after that, at their end.
+    """
+
+    limit = min(len(a), len(b))
+    prefix = 0
+
+    while prefix < limit and a[prefix] == b[prefix]:
+        prefix += 1
+
+    suffix = 0
+
+    while suffix < limit - prefix and a[-1 - suffix] == b[-1 - suffix]:
+        suffix += 1
+
+    return prefix, suffix
+
+
+def format_range(start: int, stop: int) -> str:
+    # the same range notation difflib.unified_diff uses
+    length = stop - start
+
+    if length == 1:
+        return str(start + 1)
+
+    return f"{start + 1 if length else start},{length}"
+
+
+def unified_diff(
+    a: str, b: str, a_name: str = "a", b_name: str = "b", context: int = 3
+) -> typing.List[str]:
+    """
+    Produces the lines of a unified diff between a and b, without line terminators.
+    Meant to be run in an executor.
+
+    As with diff -u, a last line lacking a newline differs from the same line with
+    one, and is followed by a "\\ No newline at end of file" marker.
+
+    Lines the inputs share at their start and end are skipped before diffing, beyond
+    the context shown around the first and last change, and the remaining lines are
+    interned to integers so the matcher compares and hashes ints instead of strings.
+    """
+
+    a_lines = a.splitlines(keepends=True)
+    b_lines = b.splitlines(keepends=True)
+
+    prefix, suffix = common_affixes(a_lines, b_lines)
+
+    if prefix == len(a_lines) == len(b_lines):
+        return []
+
+    offset = max(0, prefix - context)
+    suffix = max(0, suffix - context)
+
+    a_middle = a_lines[offset : len(a_lines) - suffix]
+    b_middle = b_lines[offset : len(b_lines) - suffix]
+
+    interned = {}
+    a_ids = [interned.setdefault(line, len(interned)) for line in a_middle]
+    b_ids = [interned.setdefault(line, len(interned)) for line in b_middle]
+
+    matcher = difflib.SequenceMatcher(None, a_ids, b_ids)
+    lines = [f"--- {a_name}", f"+++ {b_name}"]
+
+    def emit(marker: str, source: typing.List[str]):
+        for line in source:
+            text = line.splitlines()[0]
+            lines.append(marker + text)
+
+            if text == line:
+                lines.append("\\ No newline at end of file")
+
+    for group in matcher.get_grouped_opcodes(context):
+        a_range = format_range(offset + group[0][1], offset + group[-1][2])
+        b_range = format_range(offset + group[0][3], offset + group[-1][4])
+        lines.append(f"@@ -{a_range} +{b_range} @@")
+
+        for tag, a_start, a_stop, b_start, b_stop in group:
+            if tag == "equal":
+                emit(" ", a_middle[a_start:a_stop])
+                continue
+
+            if tag in ("replace", "delete"):
+                emit("-", a_middle[a_start:a_stop])
+
+            if tag in ("replace", "insert"):
+                emit("+", b_middle[b_start:b_stop])
+
+    return lines
+
+
+def diff_data(
+    a: bytes, b: bytes, a_name: str = "a", b_name: str = "b", context: int = 3
+) -> typing.List[str]:
+    """
+    Decodes a and b as guess_file_traits would and diffs them with unified_diff.
+    Meant to be run in an executor.
+    """
+
+    return unified_diff(
+        guess_file_traits(a)[0], guess_file_traits(b)[0], a_name, b_name, context
+    )
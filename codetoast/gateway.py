@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+
+import collections
+import time
+import typing
+
+__all__ = (
+    "RollingCounter",
+    "shard_for_guild",
+)
+
+
+def shard_for_guild(guild_id: typing.Union[int, str], shard_count: int) -> int:
+    return (int(guild_id) >> 22) % (shard_count or 1)
+
+
+class RollingCounter:
+    """
+    Counts keys over a rolling window split into fixed buckets, so adding is a dict
+    increment and old counts expire a whole bucket at a time.
+    """
+
+    def __init__(self, window: float = 300.0, bucket: float = 10.0):
+        self.window = window
+        self.bucket = bucket
+        self.buckets: typing.Deque[
+            typing.Tuple[float, collections.Counter]
+        ] = collections.deque()
+
+    def current(self) -> collections.Counter:
+        now = time.monotonic()
+
+        if not self.buckets or now - self.buckets[-1][0] >= self.bucket:
+            self.buckets.append((now, collections.Counter()))
+
+            while self.buckets and now - self.buckets[0][0] > self.window:
+                self.buckets.popleft()
+
+        return self.buckets[-1][1]
+
+    def add(self, key: typing.Hashable, amount: int = 1):
+        self.current()[key] += amount
+
+    def totals(self) -> typing.Tuple[collections.Counter, float]:
+        """
+        Returns the counts over the window and the number of seconds they cover.
+        """
+
+        now = time.monotonic()
+        totals = collections.Counter()
+
+        while self.buckets and now - self.buckets[0][0] > self.window:
+            self.buckets.popleft()
+
+        for _, counter in self.buckets:
+            totals.update(counter)
+
+        start = self.buckets[0][0] if self.buckets else now
+        return totals, max(now - start, 1.0)
@@ -1,11 +1,14 @@
 # -*- coding: utf-8 -*-
 
+import codecs
+import functools
 import re
 import typing
 
 __all__ = (
     'get_language',
     'guess_file_traits',
+    'guess_language',
     'LANGUAGES'
 )
 
@@ -338,6 +341,38 @@ def get_language(query: str) -> str:
 
 ENCODING_REGEX = re.compile(br'coding[=:]\s*([-\w.]+)')
 
+MODELINE_REGEXES = (
+    re.compile(r'-\*-.*?\bmode:\s*([-+\w.]+).*?-\*-', re.IGNORECASE),
+    re.compile(r'-\*-\s*([-+\w.]+)\s*-\*-'),
+    re.compile(r'\b(?:vim?|ex):.*?\b(?:ft|filetype|syn|syntax)=([-+\w.]+)'),
+)
+
+# Tokens that are characteristic of a language, with their weight.
+# The classifier picks the language whose tokens score highest in the sample.
+LANGUAGE_TOKENS = {
+    'py': (('def ', 3), ('import ', 2), ('self.', 3), ('elif ', 4), ('):\n', 2), ('None', 2)),
+    'js': (('function', 3), ('const ', 3), ('let ', 2), ('=>', 2), ('===', 4), ('console.', 4)),
+    'json': (('":', 2), ('null', 1), ('true', 1), ('false', 1)),
+    'xml': (('<?xml', 20), ('</', 2), ('/>', 2)),
+    'html': (('<!DOCTYPE html', 20), ('<div', 4), ('<span', 4), ('href=', 3), ('</html>', 10)),
+    'yaml': (('---\n', 4), (':\n  ', 1), (':\n  - ', 3), ('\n- ', 1), ('\n  - ', 2), (': |\n', 4)),
+    'ini': (('\n[', 3), (']\n', 2)),
+    'bash': (('\nfi\n', 5), ('then\n', 4), ('$(', 3), ('echo ', 3), ('esac', 6)),
+    'sql': (('SELECT ', 5), (' FROM ', 4), (' WHERE ', 4), ('INSERT INTO', 6), ('CREATE TABLE', 8)),
+    'cpp': (('#include', 6), ('std::', 5), ('int main', 5), ('nullptr', 5)),
+    'java': (('public class', 8), ('private ', 3), ('System.out', 8), ('@Override', 8)),
+    'go': (('package ', 4), ('func ', 4), (':= ', 3), ('fmt.', 5), ('err != nil', 8)),
+    'rust': (('fn ', 4), ('let mut ', 6), ('impl ', 4), ('pub fn', 6), ('-> Result', 6)),
+    'diff': (('\n@@ ', 10), ('\n+++ ', 10), ('\n--- ', 6)),
+    'markdown': (('\n# ', 3), ('\n## ', 4), ('```', 4), ('](', 3)),
+    'css': (('px;', 4), ('color:', 3), ('margin', 3), ('@media', 6)),
+}
+
+MINIMUM_SCORE = 6
+# score a sample needs per KiB of its length, so a long sample can't win on a few
+# stray matches
+MINIMUM_DENSITY = 4
+
 
 def guess_file_traits(data: bytes) -> typing.Tuple[str, str, typing.Optional[str]]:
     try:
@@ -363,4 +398,73 @@ def guess_file_traits(data: bytes) -> typing.Tuple[str, str, typing.Optional[str
     if content.startswith('#!') and '\n' in content:
         language = get_language(content[:content.find('\n')]) or language
 
-    return content, encoding, language
\ No newline at end of file
+    if not language:
+        language = find_modeline(content[:1024], content[-1024:]) or None
+
+    return content, encoding, language
+
+
+def find_modeline(head: str, tail: str) -> str:
+    lines = head.split('\n')[:5] + tail.split('\n')[-5:]
+
+    for line in lines:
+        for regex in MODELINE_REGEXES:
+            match = regex.search(line)
+
+            if match:
+                language = get_language(match.group(1))
+
+                if language:
+                    return language
+
+    return ''
+
+
+def classify_tokens(sample: str) -> str:
+    stripped = sample.lstrip()
+
+    if stripped[:1] in ('{', '[') and '":' in stripped[:256]:
+        return 'json'
+
+    best_language, best_score = '', 0
+
+    for language, tokens in LANGUAGE_TOKENS.items():
+        score = 0
+
+        for token, weight in tokens:
+            score += sample.count(token) * weight
+
+        if score > best_score:
+            best_language, best_score = language, score
+
+    if best_score < max(MINIMUM_SCORE, len(sample) * MINIMUM_DENSITY // 1024):
+        return ''
+
+    return best_language
+
+
+@functools.lru_cache(maxsize=512)
+def _guess_sample(head: str, tail: str) -> str:
+    # text doesn't contain NUL, so this is binary, which nothing should highlight
+    if '\x00' in head:
+        return ''
+
+    if head.startswith('#!') and '\n' in head:
+        language = get_language(head[:head.find('\n')])
+
+        if language:
+            return language
+
+    return find_modeline(head, tail) or classify_tokens(head)
+
+
+def guess_language(content: typing.Union[str, bytes], sample_size: int = 4096) -> str:
+    head, tail = content[:sample_size], content[-1024:]
+
+    if isinstance(content, bytes):
+        # not final, so a character cut in half at the end of the head is dropped
+        # rather than replaced
+        head = codecs.getincrementaldecoder('utf-8')('replace').decode(head)
+        tail = tail.decode('utf-8', 'replace')
+
+    return _guess_sample(head, tail)
\ No newline at end of file
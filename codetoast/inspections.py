@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+
+import collections
+import gc
+import itertools
+import reprlib
+import sys
+import time
+import types
+import typing
+
+__all__ = (
+    "DeepSize",
+    "approximate_size",
+    "deep_sizeof",
+    "estimate_sizes",
+    "inspect_lines",
+)
+
+DeepSize = collections.namedtuple("DeepSize", "size count complete")
+
+# Objects shared by the whole interpreter that a deep size walk should not descend into.
+SHARED_TYPES = (
+    type,
+    types.ModuleType,
+    types.FunctionType,
+    types.BuiltinFunctionType,
+    types.MethodType,
+    types.CodeType,
+    types.FrameType,
+)
+
+
+# Builds reprs of containers and strings piecewise up to fixed sizes, instead of
+# rendering the whole object and truncating the result.
+BOUNDED_REPR = reprlib.Repr()
+BOUNDED_REPR.maxlevel = 3
+BOUNDED_REPR.maxstring = 500
+BOUNDED_REPR.maxlong = 100
+BOUNDED_REPR.maxother = 500
+BOUNDED_REPR.maxdict = 20
+BOUNDED_REPR.maxlist = 30
+BOUNDED_REPR.maxtuple = 30
+BOUNDED_REPR.maxset = 30
+BOUNDED_REPR.maxfrozenset = 30
+BOUNDED_REPR.maxdeque = 30
+BOUNDED_REPR.maxarray = 30
+
+
+def short_repr(obj: typing.Any, limit: int = 120) -> str:
+    try:
+        text = BOUNDED_REPR.repr(obj)
+    except Exception as exception:  # pylint: disable=broad-except
+        return f"<repr failed: {type(exception).__name__}>"
+
+    text = text.replace("\n", "\\n")
+    return text if len(text) <= limit else text[: limit - 3] + "..."
+
+
+def type_name(obj: typing.Any) -> str:
+    kls = type(obj)
+    if kls.__module__ == "builtins":
+        return kls.__qualname__
+    return f"{kls.__module__}.{kls.__qualname__}"
+
+
+def deep_sizeof(
+    obj: typing.Any, budget: float = 2.0, max_objects: int = 1_000_000
+) -> DeepSize:
+    """
+    Sums sys.getsizeof over everything reachable from obj through gc.get_referents,
+    stopping early once budget seconds have passed or max_objects have been counted.
+
+    This is meant to be run in an executor.
+    """
+
+    deadline = time.perf_counter() + budget
+    seen = {id(obj)}
+    pending = [obj]
+    size = 0
+    count = 0
+
+    while pending:
+        if count >= max_objects or (
+            count % 1024 == 0 and time.perf_counter() > deadline
+        ):
+            return DeepSize(size, count, False)
+
+        current = pending.pop()
+        size += sys.getsizeof(current, 0)
+        count += 1
+
+        for referent in gc.get_referents(current):
+            if id(referent) in seen or isinstance(referent, SHARED_TYPES):
+                continue
+
+            seen.add(id(referent))
+            pending.append(referent)
+
+    return DeepSize(size, count, True)
+
+
+def inspect_lines(
+    obj: typing.Any, depth: int = 2, breadth: int = 25
+) -> typing.Iterator[str]:
+    """
+    Lazily renders a description of obj: a summary, its attributes and the objects it
+    refers to, showing at most breadth items per level and depth levels of references.
+    """
+
+    yield f"{short_repr(obj, 500)}"
+    yield f"type: {type_name(obj)}, id: {hex(id(obj))}, size: {sys.getsizeof(obj, 0)} B"
+
+    try:
+        yield f"len: {len(obj)}"
+    except Exception:  # pylint: disable=broad-except
+        pass
+
+    names = [name for name in dir(obj) if not name.startswith("__")]
+
+    yield ""
+    yield f"attributes ({min(len(names), breadth)} of {len(names)}):"
+
+    for name in names[:breadth]:
+        try:
+            value = getattr(obj, name)
+        except Exception as exception:  # pylint: disable=broad-except
+            yield f"  {name}: <{type(exception).__name__}>"
+            continue
+
+        yield f"  {name}: {type_name(value)} = {short_repr(value, 80)}"
+
+    yield ""
+    yield f"references (depth {depth}):"
+
+    yield from reference_lines(obj, 0, depth, breadth, {id(obj)})
+
+
+def reference_lines(
+    obj: typing.Any, level: int, depth: int, breadth: int, seen: typing.Set[int]
+) -> typing.Iterator[str]:
+    if level >= depth:
+        return
+
+    referents = gc.get_referents(obj)
+    shown = list(
+        itertools.islice(
+            (
+                referent
+                for referent in referents
+                if id(referent) not in seen and not isinstance(referent, SHARED_TYPES)
+            ),
+            breadth + 1,
+        )
+    )
+    indent = "  " * (level + 1)
+
+    for referent in shown[:breadth]:
+        seen.add(id(referent))
+
+        yield (
+            f"{indent}{type_name(referent)} @{hex(id(referent))}"
+            f" ({sys.getsizeof(referent, 0)} B) {short_repr(referent, 60)}"
+        )
+        yield from reference_lines(referent, level + 1, depth, breadth, seen)
+
+    if len(shown) > breadth:
+        yield f"{indent}... and more ({len(referents)} referents in total)"
+
+
+SCALAR_TYPES = (str, bytes, int, float, bool, type(None))
+CONTAINER_TYPES = (tuple, list, dict, set, frozenset)
+
+
+def approximate_size(obj: typing.Any) -> int:
+    """
+    Approximates the memory owned by a single object: its own size plus its directly
+    held scalars and containers, but not other objects that the containers refer to.
+
+    This is cheap enough to run over samples of cached Discord models, which refer to
+    each other (guild, state, ...) and would be counted many times by a deep walk.
+    """
+
+    size = sys.getsizeof(obj, 0)
+
+    names = set(getattr(obj, "__dict__", ()))
+    for kls in type(obj).__mro__:
+        slots = kls.__dict__.get("__slots__", ())
+        names.update((slots,) if isinstance(slots, str) else slots)
+
+    for name in names:
+        try:
+            value = object.__getattribute__(obj, name)
+        except AttributeError:
+            continue
+
+        if isinstance(value, SCALAR_TYPES + CONTAINER_TYPES) and value is not None:
+            size += sys.getsizeof(value, 0)
+
+            if isinstance(value, CONTAINER_TYPES) and not isinstance(value, dict):
+                size += sum(
+                    sys.getsizeof(item, 0)
+                    for item in value
+                    if isinstance(item, SCALAR_TYPES)
+                )
+
+    return size
+
+
+def estimate_sizes(
+    samples: typing.Dict[str, typing.Sequence[typing.Any]]
+) -> typing.Dict[str, float]:
+    """
+    Returns the mean approximate_size of each named sample. Meant to be run in an
+    executor.
+    """
+
+    return {
+        name: (sum(map(approximate_size, objects)) / len(objects) if objects else 0.0)
+        for name, objects in samples.items()
+    }
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+
+import bisect
+import collections
+import typing
+
+try:
+    from aiohttp import web
+except ImportError:
+    web = None
+
+__all__ = (
+    "Histogram",
+    "Metric",
+    "MetricsServer",
+    "render_metrics",
+)
+
+# name, type, help text and (labels, value) samples of one Prometheus metric family
+Metric = collections.namedtuple("Metric", "name kind help samples")
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram in the shape Prometheus expects.
+    """
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: typing.Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+
+        if index < len(self.counts):
+            self.counts[index] += 1
+
+        self.sum += value
+        self.count += 1
+
+    def samples(self, labels: dict) -> typing.Iterator[typing.Tuple[str, dict, float]]:
+        cumulative = 0
+
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            yield "_bucket", {**labels, "le": repr(bound)}, cumulative
+
+        yield "_bucket", {**labels, "le": "+Inf"}, self.count
+        yield "_sum", labels, self.sum
+        yield "_count", labels, self.count
+
+
+def escape_label(value: typing.Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_sample(name: str, labels: dict, value: float) -> str:
+    if labels:
+        label_text = ",".join(
+            f'{key}="{escape_label(label)}"' for key, label in labels.items()
+        )
+        name = f"{name}{{{label_text}}}"
+
+    return f"{name} {value!r}" if isinstance(value, float) else f"{name} {value}"
+
+
+def render_metrics(metrics: typing.Iterable[Metric]) -> str:
+    """
+    Renders metric families in the Prometheus text exposition format.
+
+    Samples of histogram families are (suffix, labels, value) triples as produced by
+    Histogram.samples; all others are (labels, value) pairs.
+    """
+
+    lines = []
+
+    for metric in metrics:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+
+        for sample in metric.samples:
+            if metric.kind == "histogram":
+                suffix, labels, value = sample
+                lines.append(format_sample(metric.name + suffix, labels, value))
+            else:
+                labels, value = sample
+                lines.append(format_sample(metric.name, labels, value))
+
+    return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """
+    Serves the output of a metrics callback on /metrics with aiohttp's web server.
+    """
+
+    content_type = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(
+        self,
+        collect: typing.Callable[[], typing.Iterable[Metric]],
+        host: str = "127.0.0.1",
+        port: int = 9100,
+    ):
+        if web is None:
+            raise RuntimeError("The metrics endpoint requires aiohttp.web")
+
+        self.collect = collect
+        self.host = host
+        self.port = port
+        self.runner: "web.AppRunner" = None
+
+    @property
+    def running(self) -> bool:
+        return self.runner is not None
+
+    async def handle(self, request: "web.Request") -> "web.Response":
+        # pylint: disable=unused-argument
+        return web.Response(
+            text=render_metrics(self.collect()),
+            headers={"Content-Type": self.content_type},
+        )
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/metrics", self.handle)
+
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+
+        try:
+            await web.TCPSite(runner, self.host, self.port).start()
+        except BaseException:
+            await runner.cleanup()
+            raise
+
+        self.runner = runner
+
+    async def stop(self):
+        if self.runner is not None:
+            runner, self.runner = self.runner, None
+            await runner.cleanup()
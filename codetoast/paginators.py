@@ -1,20 +1,33 @@
 # -*- coding: utf-8 -*-
 
+import array
 import asyncio
 import collections
+import collections.abc
+import functools
 import re
+import time
+import typing
+import weakref
 
 import discord
 from discord.ext import commands
 
-from codetoast.hljs import get_language, guess_file_traits
+from codetoast.hljs import get_language, guess_file_traits, guess_language
+
+try:
+    from discord import ui
+except ImportError:
+    ui = None
 
 __all__ = (
     "EmojiSettings",
     "PaginatorInterface",
     "PaginatorEmbedInterface",
+    "PaginatorButtonInterface",
     "WrappedPaginator",
     "FilePaginator",
+    "TextPages",
 )
 
 
@@ -28,8 +41,13 @@ EMOJI_DEFAULT = EmojiSettings(
     close="\N{BLACK SQUARE FOR STOP}",
 )
 
+# Discord API calls made by every PaginatorInterface, by kind.
+INTERFACE_CALLS = collections.Counter()
+
 
 class PaginatorInterface:
+    interfaces: "weakref.WeakSet[PaginatorInterface]" = weakref.WeakSet()
+
     def __init__(self, bot: commands.Bot, paginator: commands.Paginator, **kwargs):
         if not isinstance(paginator, commands.Paginator):
             raise TypeError("paginator must be a commands.Paginator instance")
@@ -47,6 +65,7 @@ class PaginatorInterface:
         self.delete_message = kwargs.pop("delete_message", False)
 
         self.sent_page_reactions = False
+        self.reaction_task: asyncio.Task = None
 
         self.task: asyncio.Task = None
         self.send_lock: asyncio.Event = asyncio.Event()
@@ -72,9 +91,25 @@ class PaginatorInterface:
 
         return paginator_pages
 
+    def get_page(self, index: int) -> str:
+        """
+        Renders a single page, without rendering the others as pages does.
+        """
+
+        # pylint: disable=protected-access
+        if index < len(self.paginator._pages):
+            return self.paginator._pages[index]
+
+        return (
+            "\n".join(self.paginator._current_page)
+            + "\n"
+            + (self.paginator.suffix or "")
+        )
+
     @property
     def page_count(self):
-        return len(self.pages)
+        # pylint: disable=protected-access
+        return len(self.paginator._pages) + (len(self.paginator._current_page) > 1)
 
     @property
     def display_page(self):
@@ -96,10 +131,13 @@ class PaginatorInterface:
     def send_kwargs(self) -> dict:
         display_page = self.display_page
         page_num = f"\nPage {display_page + 1}/{self.page_count}"
-        content = self.pages[display_page] + page_num
+        content = self.get_page(display_page) + page_num
         return {"content": content}
 
     async def add_line(self, *args, **kwargs):
+        self.add_line_nowait(*args, **kwargs)
+
+    def add_line_nowait(self, *args, **kwargs):
 
         display_page = self.display_page
         page_count = self.page_count
@@ -116,29 +154,60 @@ class PaginatorInterface:
     async def send_to(self, destination: discord.abc.Messageable):
 
         self.message = await destination.send(**self.send_kwargs)
-        await self.message.add_reaction(self.emojis.close)
+        INTERFACE_CALLS["send"] += 1
+        PaginatorInterface.interfaces.add(self)
 
         self.send_lock.set()
 
         if self.task:
             self.task.cancel()
 
-        self.task = self.bot.loop.create_task(self.wait_loop())
+        if self.reaction_task:
+            self.reaction_task.cancel()
+            self.reaction_task = None
+            self.sent_page_reactions = False
 
-        if not self.sent_page_reactions and self.page_count > 1:
-            await self.send_all_reactions()
+        self.task = self.bot.loop.create_task(self.wait_loop())
+        self.ensure_reactions()
 
         return self
 
+    def ensure_reactions(self):
+        # Reactions are added in the background so the interface is usable right away.
+        # They share one per-channel rate limit bucket and Discord displays them in the
+        # order they were added, so they are sent one after another in a single task
+        # rather than as concurrent requests.
+        if self.sent_page_reactions or self.page_count <= 1:
+            return
+
+        self.sent_page_reactions = True
+        self.reaction_task = self.bot.loop.create_task(self.send_all_reactions())
+
     async def send_all_reactions(self):
 
         for emoji in filter(None, self.emojis):
             try:
+                INTERFACE_CALLS["add_reaction"] += 1
                 await self.message.add_reaction(emoji)
             except discord.NotFound:
                 break
         self.sent_page_reactions = True
 
+    async def remove_reactions(self):
+        if not self.sent_page_reactions:
+            return
+
+        for emoji in filter(None, self.emojis):
+            try:
+                INTERFACE_CALLS["remove_reaction"] += 1
+                await self.message.remove_reaction(emoji, self.bot.user)
+            except (discord.Forbidden, discord.NotFound):
+                pass
+
+    @classmethod
+    def open_interfaces(cls) -> int:
+        return sum(not interface.closed for interface in cls.interfaces)
+
     @property
     def closed(self):
         if not self.task:
@@ -235,12 +304,11 @@ class PaginatorInterface:
                             self.bot.loop.create_task(self.send_lock_delayed())
                         )
 
-                if not self.sent_page_reactions and self.page_count > 1:
-                    self.bot.loop.create_task(self.send_all_reactions())
-                    self.sent_page_reactions = True
+                self.ensure_reactions()
 
                 if self.send_kwargs != last_kwargs:
                     try:
+                        INTERFACE_CALLS["edit"] += 1
                         await self.message.edit(**self.send_kwargs)
                     except discord.NotFound:
                         return
@@ -256,11 +324,7 @@ class PaginatorInterface:
             if self.delete_message:
                 return await self.message.delete()
 
-            for emoji in filter(None, self.emojis):
-                try:
-                    await self.message.remove_reaction(emoji, self.bot.user)
-                except (discord.Forbidden, discord.NotFound):
-                    pass
+            await self.remove_reactions()
 
         finally:
             for task in task_list:
@@ -275,7 +339,7 @@ class PaginatorEmbedInterface(PaginatorInterface):
     @property
     def send_kwargs(self) -> dict:
         display_page = self.display_page
-        self._embed.description = self.pages[display_page]
+        self._embed.description = self.get_page(display_page)
         self._embed.set_footer(text=f"Page `{display_page + 1}`/**{self.page_count}**")
         return {"embed": self._embed}
 
@@ -286,6 +350,84 @@ class PaginatorEmbedInterface(PaginatorInterface):
         return self.paginator.max_size
 
 
+class PaginatorButtonInterface(PaginatorInterface):
+    """
+    PaginatorInterface variant that navigates with message components instead of
+    reactions. Requires a discord.py version with ``discord.ui``.
+    """
+
+    def __init__(self, *args, **kwargs):
+        if ui is None:
+            raise RuntimeError(
+                "PaginatorButtonInterface requires a discord.py version with discord.ui"
+            )
+
+        super().__init__(*args, **kwargs)
+        self.view = ui.View(timeout=None)
+
+        start, back, forward, end, close = self.emojis
+
+        for emoji, action in (
+            (start, self.button_start),
+            (back, self.button_back),
+            (forward, self.button_forward),
+            (end, self.button_end),
+            (close, self.button_close),
+        ):
+            if emoji:
+                button = ui.Button(emoji=emoji, style=discord.ButtonStyle.secondary)
+                button.callback = self.wrap_button(action)
+                self.view.add_item(button)
+
+    def wrap_button(self, action):
+        async def callback(interaction: discord.Interaction):
+            if self.owner and interaction.user.id != self.owner.id:
+                return await interaction.response.defer()
+
+            if await action():
+                return await interaction.response.defer()
+
+            INTERFACE_CALLS["edit"] += 1
+            await interaction.response.edit_message(**self.send_kwargs)
+
+        return callback
+
+    async def button_start(self):
+        self._display_page = 0
+
+    async def button_back(self):
+        self._display_page -= 1
+
+    async def button_forward(self):
+        self._display_page += 1
+
+    async def button_end(self):
+        self._display_page = self.page_count - 1
+
+    async def button_close(self):
+        if self.task:
+            self.task.cancel()
+
+        self.view.stop()
+        await self.message.delete()
+        return True
+
+    @property
+    def send_kwargs(self) -> dict:
+        return {**super().send_kwargs, "view": self.view}
+
+    def ensure_reactions(self):
+        pass
+
+    async def remove_reactions(self):
+        self.view.stop()
+
+        try:
+            await self.message.edit(view=None)
+        except discord.NotFound:
+            pass
+
+
 class WrappedPaginator(commands.Paginator):
     def __init__(
         self,
@@ -300,46 +442,234 @@ class WrappedPaginator(commands.Paginator):
         self.include_wrapped = include_wrapped
         self.force_wrap = force_wrap
 
-    def add_line(self, line="", *, empty=False):
+    def wrap_span(self, text: str, start: int = 0, end: int = None):
+        """
+        Yields the (start, end) spans that text[start:end] is wrapped into, so that
+        wrapping doesn't need to copy the rest of the line for every piece.
+        """
+
+        end = len(text) if end is None else end
         true_max_size = self.max_size - self._prefix_len - self._suffix_len - 2
-        original_length = len(line)
+        original_length = end - start
 
-        while len(line) > true_max_size:
-            search_string = line[0 : true_max_size - 1]
+        while end - start > true_max_size:
+            search_string = text[start : start + true_max_size - 1]
             wrapped = False
 
             for delimiter in self.wrap_on:
                 position = search_string.rfind(delimiter)
 
                 if position > 0:
-                    super().add_line(line[0:position], empty=empty)
+                    yield start, start + position
                     wrapped = True
 
                     if self.include_wrapped:
-                        line = line[position:]
+                        start += position
                     else:
-                        line = line[position + len(delimiter) :]
+                        start += position + len(delimiter)
 
                     break
 
             if not wrapped:
                 if self.force_wrap:
-                    super().add_line(line[0 : true_max_size - 1])
-                    line = line[true_max_size - 1 :]
+                    yield start, start + true_max_size - 1
+                    start += true_max_size - 1
                 else:
                     raise ValueError(
-                        f"Line of length `{original_length}` had sequence of `{len(line)}` characters"
+                        f"Line of length `{original_length}` had sequence of `{end - start}` characters"
                         f" (max is {true_max_size}) that WrappedPaginator could not wrap with"
                         f" delimiters: `{self.wrap_on}`"
                     )
 
-        super().add_line(line, empty=empty)
+        yield start, end
+
+    def add_line(self, line="", *, empty=False):
+        if len(line) <= self.max_size - self._prefix_len - self._suffix_len - 2:
+            return super().add_line(line, empty=empty)
+
+        for start, end in self.wrap_span(line):
+            super().add_line(line[start:end], empty=empty and end == len(line))
+
+
+class TextPages(collections.abc.Sequence):
+    """
+    Paginator pages kept as spans of shared buffers instead of one string per page.
+
+    Paginating a file this way costs a few bytes per page on top of the file content
+    itself, and each page is only rendered when it is looked up.
+    """
+
+    __slots__ = ("buffers", "spans", "page_ends", "prefix", "suffix")
+
+    def __init__(self, content: str = "", prefix: str = "```", suffix: str = "```"):
+        self.buffers: typing.List[str] = [content]
+        # (buffer index, start, end) triples, and the number of spans up to each page end
+        self.spans = array.array("I")
+        self.page_ends = array.array("I")
+        self.prefix = prefix
+        self.suffix = suffix
+
+    @property
+    def open_spans(self) -> int:
+        return len(self.spans) // 3 - (self.page_ends[-1] if self.page_ends else 0)
+
+    def add_span(self, start: int, end: int, buffer: int = 0):
+        spans = self.spans
+
+        # consecutive lines of the same buffer are kept as a single span
+        if (
+            self.open_spans
+            and spans[-3] == buffer
+            and spans[-1] + 1 == start
+            and self.buffers[buffer][spans[-1]] == "\n"
+        ):
+            spans[-1] = end
+        else:
+            spans.extend((buffer, start, end))
+
+    def add_text(self, text: str):
+        self.buffers.append(text)
+        self.add_span(0, len(text), len(self.buffers) - 1)
+
+    def close_page(self):
+        self.page_ends.append(len(self.spans) // 3)
+
+    def footprint(self, shared: str = None) -> int:
+        """
+        Approximates the memory held by these pages beyond the shared buffer.
+        """
+
+        size = (len(self.spans) + len(self.page_ends)) * self.spans.itemsize
+
+        for buffer in self.buffers:
+            if buffer is not shared:
+                size += len(buffer)
+
+        return size
+
+    def __len__(self):
+        return len(self.page_ends)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[item] for item in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+
+        if not 0 <= index < len(self):
+            raise IndexError("page index out of range")
+
+        spans, buffers = self.spans, self.buffers
+        first = self.page_ends[index - 1] if index else 0
+
+        parts = [
+            buffers[spans[span * 3]][spans[span * 3 + 1] : spans[span * 3 + 2]]
+            for span in range(first, self.page_ends[index])
+        ]
+
+        return "\n".join(
+            part for part in (self.prefix, *parts, self.suffix) if part is not None
+        )
+
+
+def line_offset(content: str, line: int, block_size: int = 64 * 1024) -> int:
+    """
+    Returns where the given 0-indexed line starts, or just past the end of content if
+    it has fewer lines.
+
+    Newlines are counted a block at a time, so only the last block is walked line by
+    line.
+    """
+
+    offset = 0
+
+    while line and offset < len(content):
+        count = content.count("\n", offset, offset + block_size)
+
+        if count >= line:
+            break
+
+        line -= count
+        offset += block_size
+
+    for _ in range(line):
+        offset = content.find("\n", offset) + 1
+
+        if not offset:
+            return len(content) + 1
+
+    return offset
 
 
 class FilePaginator(commands.Paginator):
     __encoding_regex = re.compile(br"coding[=:]\s*([-\w.]+)")
 
     def __init__(self, fp, line_span=None, language_hints=(), **kwargs):
+        start, end = self.prepare(fp, line_span, language_hints, **kwargs)
+        self.add_content(start, end)
+        self.close_page()
+
+    @classmethod
+    async def create(
+        cls,
+        fp,
+        line_span=None,
+        language_hints=(),
+        *,
+        max_blocking: float = 0.005,
+        executor: bool = False,
+        loop: asyncio.AbstractEventLoop = None,
+        **kwargs,
+    ):
+        """
+        Builds a paginator without holding up the event loop.
+
+        Reading and decoding always happen in an executor. With executor, so does
+        pagination; otherwise pages are added on the loop in batches of at most
+        max_blocking seconds, and the longest batch is kept as max_blocked (which stays
+        0.0 for paginators built off the loop).
+        """
+
+        loop = loop or asyncio.get_event_loop()
+
+        if executor:
+            return await loop.run_in_executor(
+                None, functools.partial(cls, fp, line_span, language_hints, **kwargs)
+            )
+
+        paginator = cls.__new__(cls)
+        start, end = await loop.run_in_executor(
+            None,
+            functools.partial(
+                paginator.prepare, fp, line_span, language_hints, **kwargs
+            ),
+        )
+
+        batch_start = time.perf_counter()
+
+        for _ in paginator.iter_content(start, end):
+            elapsed = time.perf_counter() - batch_start
+
+            if elapsed >= max_blocking:
+                paginator.max_blocked = max(paginator.max_blocked, elapsed)
+                await asyncio.sleep(0)
+                batch_start = time.perf_counter()
+
+        paginator.close_page()
+        paginator.max_blocked = max(
+            paginator.max_blocked, time.perf_counter() - batch_start
+        )
+
+        return paginator
+
+    def prepare(self, fp, line_span=None, language_hints=(), **kwargs):
+        """
+        Reads and decodes fp, sets up the paginator for its language and returns the
+        span of the content to paginate.
+        """
+
+        self.max_blocked = 0.0
         language = ""
 
         for hint in language_hints:
@@ -354,26 +684,141 @@ class FilePaginator(commands.Paginator):
             except AttributeError:
                 pass
 
-        content, _, file_language = guess_file_traits(fp.read())
+        # Already decoded content can be passed in place of fp, and is then shared
+        # with the pages instead of copied.
+        data = fp if isinstance(fp, str) else fp.read()
 
-        language = file_language or language
-        lines = content.split("\n")
+        if isinstance(data, str):
+            content, file_language = data, None
+        else:
+            content, _, file_language = guess_file_traits(data)
+
+        language = file_language or language or guess_language(content)
 
         super().__init__(prefix=f"```{language}", suffix="```", **kwargs)
+        self._pages = TextPages(content, self.prefix, self.suffix)
+
+        start, end = 0, len(content)
 
         if line_span:
             line_span = sorted(line_span)
 
-            if min(line_span) < 1 or max(line_span) > len(lines):
+            if min(line_span) < 1 or max(line_span) > content.count("\n") + 1:
                 raise ValueError("Linespan goes out of bounds.")
 
-            lines = lines[line_span[0] - 1 : line_span[1]]
+            start = line_offset(content, line_span[0] - 1)
+            end = line_offset(content, line_span[1]) - 1
+
+        return start, end
+
+    def add_content(self, start: int, end: int):
+        for _ in self.iter_content(start, end):
+            pass
+
+    def iter_content(self, start: int, end: int) -> typing.Iterator[None]:
+        """
+        Adds the lines of content[start:end], finding each page break with a single
+        rfind rather than splitting the content into a string per line.
+
+        This yields after every addition, so callers can pause between them.
+        """
+
+        content = self._pages.buffers[0]
+
+        while True:
+            # the room left for a run of lines, each costing its length plus a newline
+            room = self.max_size - self._suffix_len - self._count - 1
+
+            if end - start <= room:
+                yield from self.iter_line(start, end)
+                return
+
+            stop = content.rfind("\n", start, start + room + 1)
+
+            if stop != -1:
+                yield from self.iter_line(start, stop)
+                start = stop + 1
+            else:
+                # the next line doesn't fit on this page, so add it on its own
+                stop = content.find("\n", start, end)
+                stop = end if stop == -1 else stop
+
+                yield from self.iter_line(start, stop)
+
+                if stop == end:
+                    return
 
-        for line in lines:
-            self.add_line(line)
+                start = stop + 1
+
+    def iter_line(self, start: int, end: int) -> typing.Iterator[None]:
+        """
+        Adds content[start:end] as a single line, yielding once it has been added.
+        """
+
+        self.add_span(start, end)
+        yield
+
+    def add_span(self, start: int, end: int):
+        """
+        Adds content[start:end] as a single line, like add_line.
+        """
+
+        max_page_size = self.max_size - self._prefix_len - self._suffix_len - 2
+
+        if end - start > max_page_size:
+            raise RuntimeError(f"Line exceeds maximum page size {max_page_size}")
+
+        if self._count + end - start + 1 > self.max_size - self._suffix_len:
+            self.close_page()
+
+        self.flush_lines()
+        self._count += end - start + 1
+        self._pages.add_span(start, end)
+
+    def flush_lines(self):
+        """
+        Moves lines added through add_line into the page storage.
+        """
+
+        if len(self._current_page) > 1 and isinstance(self._pages, TextPages):
+            self._pages.add_text("\n".join(self._current_page[1:]))
+            self._current_page = [self.prefix]
+
+    def close_page(self):
+        if not isinstance(self._pages, TextPages):
+            return super().close_page()
+
+        self.flush_lines()
+        self._pages.close_page()
+        self._current_page = [self.prefix]
+        self._count = len(self.prefix) + 1
+
+    @property
+    def pages(self):
+        if len(self._current_page) > 1 or (
+            isinstance(self._pages, TextPages) and self._pages.open_spans
+        ):
+            self.close_page()
+
+        return self._pages
+
+    @classmethod
+    def from_pages(cls, pages, prefix="```", suffix="```", **kwargs):
+        paginator = cls.__new__(cls)
+        super(FilePaginator, paginator).__init__(prefix=prefix, suffix=suffix, **kwargs)
+        # pylint: disable=protected-access
+        paginator._pages = pages if isinstance(pages, TextPages) else list(pages)
+        return paginator
 
 
 class WrappedFilePaginator(FilePaginator, WrappedPaginator):
     """
     CodeToast WrappedFilePaginator
     """
+
+    def iter_line(self, start: int, end: int) -> typing.Iterator[None]:
+        for piece_start, piece_end in self.wrap_span(
+            self._pages.buffers[0], start, end
+        ):
+            self.add_span(piece_start, piece_end)
+            yield
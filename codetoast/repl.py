@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+
+import ast
+import functools
+import hashlib
+import inspect
+import linecache
+import time
+import traceback
+import types
+import typing
+
+__all__ = (
+    "CPUTimer",
+    "LineStream",
+    "compile_source",
+    "execute",
+    "format_exception",
+)
+
+REPL_FUNCTION = "_toast_repl"
+REPL_FILENAME = "<toast py {}>"
+
+
+def contains_yield(statements: typing.List[ast.stmt]) -> bool:
+    pending = list(statements)
+
+    while pending:
+        node = pending.pop()
+
+        if isinstance(node, (ast.Yield, ast.YieldFrom)):
+            return True
+
+        if isinstance(
+            node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda, ast.ClassDef)
+        ):
+            continue
+
+        pending.extend(ast.iter_child_nodes(node))
+
+    return False
+
+
+@functools.lru_cache(maxsize=128)
+def compile_source(source: str) -> types.CodeType:
+    """
+    Compiles source into a module that defines an async function running it, so that
+    top-level await works on every supported Python version.
+
+    If the source ends with an expression, its value is returned, or yielded when the
+    source already yields values of its own. Compiled code is cached by source, and
+    the source is registered with linecache so tracebacks can show it.
+    """
+
+    filename = REPL_FILENAME.format(
+        hashlib.sha1(source.encode("utf-8")).hexdigest()[:8]
+    )
+    tree = ast.parse(source, filename, "exec")
+    body = tree.body or [ast.Pass()]
+
+    if isinstance(body[-1], ast.Expr):
+        last = body[-1]
+
+        if contains_yield(body):
+            body[-1] = ast.Expr(ast.Yield(last.value))
+        else:
+            body[-1] = ast.Return(last.value)
+
+        ast.copy_location(body[-1], last)
+
+    module = ast.parse(f"async def {REPL_FUNCTION}():\n    pass", filename, "exec")
+    module.body[0].body = body
+
+    code = compile(ast.fix_missing_locations(module), filename, "exec")
+    linecache.cache[filename] = (
+        len(source),
+        None,
+        [line + "\n" for line in source.splitlines()],
+        filename,
+    )
+
+    return code
+
+
+def format_exception(exception: BaseException) -> typing.List[str]:
+    """
+    Formats an exception raised by executed source, leaving out the frames of the
+    executor itself.
+    """
+
+    tb = exception.__traceback__
+
+    while tb is not None and not tb.tb_frame.f_code.co_filename.startswith("<toast py"):
+        tb = tb.tb_next
+
+    if tb is None:
+        lines = traceback.format_exception_only(type(exception), exception)
+    else:
+        lines = traceback.format_exception(type(exception), exception, tb)
+
+    return "".join(lines).rstrip("\n").split("\n")
+
+
+class CPUTimer:
+    """
+    Accumulates the CPU time spent stepping the awaitables passed through measure,
+    excluding the time other tasks run while they are suspended.
+    """
+
+    def __init__(self):
+        self.cpu = 0.0
+
+    @types.coroutine
+    def measure(self, awaitable: typing.Awaitable):
+        iterator = awaitable.__await__()
+        send, throw = None, None
+
+        while True:
+            start = time.thread_time()
+
+            try:
+                if throw is not None:
+                    result = iterator.throw(throw)
+                else:
+                    result = iterator.send(send)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                self.cpu += time.thread_time() - start
+
+            try:
+                send, throw = (yield result), None
+            except BaseException as exception:  # pylint: disable=broad-except
+                send, throw = None, exception
+
+
+class LineStream:
+    """
+    File-like object that hands every complete line written to it to a callback.
+    """
+
+    def __init__(self, callback: typing.Callable[[str], typing.Any]):
+        self.callback = callback
+        self.buffer = ""
+
+    def write(self, text: str) -> int:
+        self.buffer += text
+        *lines, self.buffer = self.buffer.split("\n")
+
+        for line in lines:
+            self.callback(line)
+
+        return len(text)
+
+    def flush(self):
+        if self.buffer:
+            self.callback(self.buffer)
+            self.buffer = ""
+
+
+async def execute(
+    source: str,
+    scope: dict,
+    timer: CPUTimer,
+    result_callback: typing.Callable[[typing.Any], typing.Awaitable],
+):
+    """
+    Runs source with scope as its globals, awaiting result_callback with every value it
+    yields or returns that is not None.
+    """
+
+    exec(compile_source(source), scope)  # pylint: disable=exec-used
+    function = scope.pop(REPL_FUNCTION)
+
+    if inspect.isasyncgenfunction(function):
+        generator = function()
+
+        try:
+            while True:
+                try:
+                    result = await timer.measure(generator.__anext__())
+                except StopAsyncIteration:
+                    break
+
+                if result is not None:
+                    await result_callback(result)
+        finally:
+            await generator.aclose()
+    else:
+        result = await timer.measure(function())
+
+        if result is not None:
+            await result_callback(result)
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import codecs
+import collections
+import os
+import shutil
+import signal
+import sys
+import typing
+
+__all__ = (
+    "ShellResult",
+    "create_shell",
+    "run_shell",
+    "terminate",
+)
+
+WINDOWS = sys.platform == "win32"
+
+
+ShellResult = collections.namedtuple("ShellResult", "returncode output_size stopped")
+
+
+def shell_arguments(command: str) -> typing.List[str]:
+    if WINDOWS:
+        return [os.environ.get("COMSPEC", "cmd.exe"), "/c", command]
+
+    return [os.environ.get("SHELL") or shutil.which("bash") or "/bin/sh", "-c", command]
+
+
+async def create_shell(command: str) -> asyncio.subprocess.Process:
+    """
+    Starts a shell running command, with stderr merged into stdout so lines keep the
+    order they were written in. On POSIX the shell leads its own process group, so
+    terminate can stop everything it spawned.
+    """
+
+    kwargs = {} if WINDOWS else {"start_new_session": True}
+
+    return await asyncio.create_subprocess_exec(
+        *shell_arguments(command),
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT,
+        **kwargs,
+    )
+
+
+async def terminate(
+    process: asyncio.subprocess.Process, drain_timeout: float = 1.0
+) -> int:
+    """
+    Kills the process and reaps it. On POSIX the whole session is killed, even when
+    the shell itself has already exited, so background children don't outlive it.
+
+    Leftover output is read and discarded, as asyncio only reports the exit once the
+    pipe has been closed. If something outside the session still holds the pipe after
+    drain_timeout seconds, the transport is closed instead.
+    """
+
+    try:
+        if not WINDOWS:
+            os.killpg(process.pid, signal.SIGKILL)
+        elif process.returncode is None:
+            process.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
+
+    async def drain():
+        while await process.stdout.read(64 * 1024):
+            pass
+
+    try:
+        await asyncio.wait_for(drain(), drain_timeout)
+    except asyncio.TimeoutError:
+        process._transport.close()  # pylint: disable=protected-access
+
+    return await process.wait()
+
+
+async def run_shell(
+    command: str,
+    write: typing.Callable[[str], typing.Any],
+    output_limit: int = 1024 * 1024,
+    timeout: float = 300.0,
+    chunk_size: int = 16 * 1024,
+) -> ShellResult:
+    """
+    Runs command in a shell, passing its decoded output to write as it arrives.
+
+    Output is read in chunks rather than by line, so one enormous line can't grow a
+    buffer without bound, and every read gives other tasks a chance to run. The
+    process is killed once output_limit bytes have been read or timeout seconds have
+    passed, and also if the awaiting task is cancelled.
+    """
+
+    output_size = 0
+    stopped = None
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    loop = asyncio.get_event_loop()
+    deadline = loop.time() + timeout
+
+    process = await create_shell(command)
+
+    try:
+        while True:
+            try:
+                chunk = await asyncio.wait_for(
+                    process.stdout.read(chunk_size), deadline - loop.time()
+                )
+            except asyncio.TimeoutError:
+                stopped = f"timed out after {timeout:g}s"
+                break
+
+            if not chunk:
+                break
+
+            chunk = chunk[: output_limit - output_size]
+            output_size += len(chunk)
+            write(decoder.decode(chunk))
+
+            if output_size >= output_limit:
+                stopped = f"output limit of {output_limit} bytes reached"
+                break
+
+        write(decoder.decode(b"", final=True))
+
+        if stopped is None:
+            try:
+                await asyncio.wait_for(process.wait(), deadline - loop.time())
+            except asyncio.TimeoutError:
+                stopped = f"timed out after {timeout:g}s"
+    finally:
+        # Shielded so that a cancelled command still reaps its process.
+        returncode = await asyncio.shield(terminate(process))
+
+    return ShellResult(returncode, output_size, stopped)
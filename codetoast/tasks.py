@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import collections
+import linecache
+import time
+import types
+import typing
+import weakref
+
+__all__ = (
+    "TaskInfo",
+    "TaskTracker",
+    "await_frames",
+)
+
+TaskInfo = collections.namedtuple("TaskInfo", "task name coroutine location age idle")
+
+
+def get_coro(task: asyncio.Task):
+    try:
+        return task.get_coro()
+    except AttributeError:
+        return task._coro  # pylint: disable=protected-access
+
+
+def await_frames(task: asyncio.Task) -> typing.List[types.FrameType]:
+    """
+    Follows the chain of awaited coroutines from a task's coroutine down to the frame
+    that is currently suspended, which Task.get_stack does not do.
+    """
+
+    frames = []
+    coro = get_coro(task)
+
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+
+        if frame is None:
+            break
+
+        frames.append(frame)
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+
+    return frames
+
+
+def no_waiter():
+    return None
+
+
+def format_frame(frame: types.FrameType) -> str:
+    code = frame.f_code
+    return f"{code.co_filename}:{frame.f_lineno} in {code.co_name}"
+
+
+class TaskTracker:
+    """
+    Keeps cheap per-task bookkeeping that asyncio does not: when each task was created
+    (or first seen) and when its await point last changed between samples.
+    """
+
+    def __init__(self, sample_interval: float = 1.0):
+        self.sample_interval = sample_interval
+        self.created: "weakref.WeakKeyDictionary[asyncio.Task, float]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self.last_seen: "weakref.WeakKeyDictionary[asyncio.Task, tuple]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self.sampler: asyncio.Task = None
+        self.loop: asyncio.AbstractEventLoop = None
+        self.factory = None
+
+    def install(self, loop: asyncio.AbstractEventLoop):
+        """
+        Installs a task factory that records creation times, if the loop has none.
+        """
+
+        self.loop = loop
+
+        if loop.get_task_factory() is not None:
+            return
+
+        def factory(loop, coro, **kwargs):
+            task = asyncio.Task(coro, loop=loop, **kwargs)
+            self.created[task] = time.monotonic()
+            return task
+
+        self.factory = factory
+        loop.set_task_factory(factory)
+
+    def uninstall(self):
+        if self.sampler:
+            self.sampler.cancel()
+            self.sampler = None
+
+        if self.loop is not None and self.loop.get_task_factory() is self.factory:
+            self.loop.set_task_factory(None)
+
+    def start_sampling(self):
+        if self.sampler is None or self.sampler.done():
+            self.sampler = self.loop.create_task(self.sample_loop())
+
+    async def sample_loop(self):
+        while True:
+            self.sample()
+            await asyncio.sleep(self.sample_interval)
+
+    def sample(self) -> typing.List[TaskInfo]:
+        now = time.monotonic()
+        infos = []
+
+        for task in asyncio.all_tasks(self.loop):
+            frames = await_frames(task)
+            innermost = frames[-1] if frames else None
+            position = (id(innermost), innermost.f_lasti) if innermost else None
+
+            # Every suspension waits on a new future, so a task that keeps waking up
+            # at the same await is told apart by the future it is waiting on. It is
+            # held by weakref so that a reused id can't pass for the same future.
+            waiter = getattr(task, "_fut_waiter", None)
+
+            created = self.created.setdefault(task, now)
+            previous = self.last_seen.get(task)
+
+            if (
+                previous is None
+                or previous[0] != position
+                or previous[2]() is not waiter
+            ):
+                self.last_seen[task] = (
+                    position,
+                    now,
+                    weakref.ref(waiter) if waiter is not None else no_waiter,
+                )
+                changed = now
+            else:
+                changed = previous[1]
+
+            coro = get_coro(task)
+
+            infos.append(
+                TaskInfo(
+                    task,
+                    task.get_name() if hasattr(task, "get_name") else hex(id(task)),
+                    getattr(coro, "__qualname__", type(coro).__name__),
+                    format_frame(innermost) if innermost else "(not started)",
+                    now - created,
+                    now - changed,
+                )
+            )
+
+        return infos
+
+    @staticmethod
+    def format_stack(task: asyncio.Task) -> typing.List[str]:
+        lines = []
+
+        for frame in await_frames(task):
+            lines.append(f"  {format_frame(frame)}")
+            source = linecache.getline(frame.f_code.co_filename, frame.f_lineno).strip()
+
+            if source:
+                lines.append(f"    {source}")
+
+        return lines
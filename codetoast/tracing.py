@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+
+import time
+import typing
+
+import aiohttp
+import humanize
+
+__all__ = (
+    "RequestTiming",
+    "create_trace_config",
+)
+
+
+class RequestTiming:
+    """
+    Timestamps of a single aiohttp request, filled in by the hooks of create_trace_config.
+
+    aiohttp opens the TCP connection and performs the TLS handshake in one step, so the
+    connect phase includes TLS for https URLs. Its hooks also wrap host resolution, so
+    the connect phase is measured from the end of DNS when there was a lookup.
+    """
+
+    def __init__(self):
+        self.start: typing.Optional[float] = None
+        self.dns_start: typing.Optional[float] = None
+        self.dns_end: typing.Optional[float] = None
+        self.connect_start: typing.Optional[float] = None
+        self.connect_end: typing.Optional[float] = None
+        self.headers: typing.Optional[float] = None
+        self.end: typing.Optional[float] = None
+        self.reused: bool = False
+        self.tls: bool = False
+        self.size: int = 0
+
+    @staticmethod
+    def span(start: typing.Optional[float], end: typing.Optional[float]):
+        if start is None or end is None:
+            return None
+        return end - start
+
+    @property
+    def dns(self):
+        return self.span(self.dns_start, self.dns_end)
+
+    @property
+    def connect(self):
+        opened = max(filter(None, (self.connect_start, self.dns_end)), default=None)
+        return self.span(opened, self.connect_end)
+
+    @property
+    def ttfb(self):
+        sent = max(
+            filter(None, (self.start, self.dns_end, self.connect_end)), default=None
+        )
+        return self.span(sent, self.headers)
+
+    @property
+    def transfer(self):
+        return self.span(self.headers, self.end)
+
+    @property
+    def total(self):
+        return self.span(self.start, self.end)
+
+    @property
+    def rate(self):
+        transfer = self.transfer
+        if not transfer:
+            return None
+        return self.size / transfer
+
+    def summary(self) -> str:
+        def fmt(value):
+            return "-" if value is None else f"{value * 1000:.1f}ms"
+
+        rate = self.rate
+        connection = "reused pooled connection" if self.reused else "new connection"
+
+        return (
+            f"DNS {fmt(self.dns)}, connect{' + TLS' if self.tls else ''} {fmt(self.connect)}, "
+            f"TTFB {fmt(self.ttfb)}, transfer {fmt(self.transfer)}, total {fmt(self.total)}; "
+            f"{humanize.naturalsize(self.size, binary=True)}"
+            f"{f' at {humanize.naturalsize(rate, binary=True)}/s' if rate else ''}"
+            f" over a {connection}"
+        )
+
+
+def create_trace_config() -> aiohttp.TraceConfig:
+    """
+    Creates a TraceConfig that records into the RequestTiming passed as trace_request_ctx.
+    """
+
+    trace_config = aiohttp.TraceConfig()
+
+    def record(attribute: str):
+        async def hook(session, context, params):
+            timing = context.trace_request_ctx
+
+            if isinstance(timing, RequestTiming):
+                setattr(timing, attribute, time.perf_counter())
+
+        return hook
+
+    async def on_request_start(session, context, params):
+        timing = context.trace_request_ctx
+
+        if isinstance(timing, RequestTiming):
+            timing.start = time.perf_counter()
+            timing.tls = params.url.scheme == "https"
+
+    async def on_connection_reuseconn(session, context, params):
+        timing = context.trace_request_ctx
+
+        if isinstance(timing, RequestTiming):
+            timing.reused = True
+
+    async def on_response_chunk_received(session, context, params):
+        timing = context.trace_request_ctx
+
+        if isinstance(timing, RequestTiming):
+            timing.size += len(params.chunk)
+
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_dns_resolvehost_start.append(record("dns_start"))
+    trace_config.on_dns_resolvehost_end.append(record("dns_end"))
+    trace_config.on_connection_create_start.append(record("connect_start"))
+    trace_config.on_connection_create_end.append(record("connect_end"))
+    trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+    trace_config.on_request_end.append(record("headers"))
+    trace_config.on_response_chunk_received.append(on_response_chunk_received)
+
+    return trace_config
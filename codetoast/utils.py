@@ -1,8 +1,12 @@
 # -*- coding: utf-8 -*-
 
+import lzma
 import pathlib
 import typing
+import zlib
+import discord
 import pkg_resources
+from discord.ext import commands
 
 
 def package_version(package_name: str) -> typing.Optional[str]:
@@ -11,3 +15,69 @@ def package_version(package_name: str) -> typing.Optional[str]:
         return pkg_resources.get_distribution(package_name).version
     except (pkg_resources.DistributionNotFound, AttributeError):
         return None
+
+
+def get_var_dict_from_ctx(ctx: commands.Context) -> dict:
+    return {
+        "author": ctx.author,
+        "bot": ctx.bot,
+        "channel": ctx.channel,
+        "commands": commands,
+        "ctx": ctx,
+        "discord": discord,
+        "guild": ctx.guild,
+        "message": ctx.message,
+        "msg": ctx.message,
+    }
+
+
+def strip_codeblock(content: str) -> str:
+    if content.startswith("```") and content.endswith("```"):
+        content = content[3:-3]
+        first_line, _, rest = content.partition("\n")
+
+        if rest and first_line.strip().isalnum():
+            content = rest
+
+    return content.strip("` \n")
+
+
+COMPRESSORS = (
+    ("gz", lambda: zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)),
+    ("xz", lambda: lzma.LZMACompressor(format=lzma.FORMAT_XZ)),
+)
+
+
+def compress_payload(
+    data: bytes, limit: int, chunk_size: int = 1024 * 1024
+) -> typing.Optional[typing.Tuple[bytes, str]]:
+    """
+    Compresses data chunk by chunk with each of the COMPRESSORS in turn, returning the
+    first result that fits within limit along with its file extension.
+
+    A compressor is abandoned as soon as its output grows past the limit.
+    """
+
+    view = memoryview(data)
+
+    for extension, factory in COMPRESSORS:
+        compressor = factory()
+        chunks = []
+        size = 0
+
+        for offset in range(0, len(view), chunk_size):
+            chunk = compressor.compress(view[offset : offset + chunk_size])
+            chunks.append(chunk)
+            size += len(chunk)
+
+            if size > limit:
+                break
+        else:
+            chunk = compressor.flush()
+            chunks.append(chunk)
+            size += len(chunk)
+
+            if size <= limit:
+                return b"".join(chunks), extension
+
+    return None